@@ -0,0 +1,204 @@
+"""
+Out-of-core batched matrix multiplication.
+
+Multiplies a stack of matrices stored in a .npy file against one constant
+matrix that stays in RAM, writing every product straight into a memory-mapped
+.npy output. Only the constant matrix and a couple of input buffers live in
+memory, so the original 500 × (5000 × 5000) float32 workload (~50 GB of
+inputs, ~50 GB of outputs) runs on a machine with far less RAM.
+
+A reader thread prefetches the next matrices from disk into a small ring of
+buffers (double buffering by default) while the current one is multiplied,
+so disk I/O overlaps with the BLAS computation.
+
+Usage:
+  python batched_gemm.py generate inputs.npy --num 500 --size 5000
+  python batched_gemm.py run inputs.npy results.npy [--constant constant.npy]
+"""
+
+import os
+import time
+import queue
+import argparse
+import threading
+import numpy as np
+
+
+def create_input_stack(path, num_matrices, size, dtype=np.float32, seed=None):
+    """
+    Write num_matrices random size×size matrices to a .npy file one matrix at
+    a time (never more than one in memory).
+    Returns: read-only memmap of the stack
+    """
+    rng = np.random.default_rng(seed)
+    stack = np.lib.format.open_memmap(path, mode="w+", dtype=dtype,
+                                      shape=(num_matrices, size, size))
+    for i in range(num_matrices):
+        stack[i] = rng.random((size, size), dtype=np.float32).astype(dtype, copy=False)
+    stack.flush()
+    del stack
+    return np.load(path, mmap_mode="r")
+
+
+def _npy_layout(path):
+    """Return (shape, dtype, data_offset) of a .npy file without loading it."""
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        if fortran:
+            raise ValueError(f"{path}: Fortran-ordered arrays are not supported")
+        return shape, dtype, f.tell()
+
+
+def _prefetch(path, offset, matrix_bytes, indices, free, ready, stop):
+    """Reader thread: fill free buffers with the next input matrices."""
+    try:
+        with open(path, "rb", buffering=0) as f:
+            for i in indices:
+                buf = free.get()
+                if stop.is_set():
+                    return
+                f.seek(offset + i * matrix_bytes)
+                view = memoryview(buf.reshape(-1).view(np.uint8))
+                read = 0
+                while read < matrix_bytes:        # readinto releases the GIL
+                    n = f.readinto(view[read:])
+                    if not n:
+                        raise IOError(f"{path}: unexpected end of file at matrix {i}")
+                    read += n
+                ready.put((i, buf))
+        ready.put(None)
+    except BaseException as e:                    # hand the error to the compute loop
+        ready.put(e)
+
+
+def batched_matmul(input_path, constant, output_path, prefetch=2, indices=None,
+                   flush_every=8):
+    """
+    Compute output[i] = input[i] @ constant for every matrix in the input stack.
+
+    Parameters
+    ----------
+    input_path  : str          .npy file holding an (N, n, k) stack
+    constant    : np.ndarray   (k, m) matrix kept resident in RAM
+    output_path : str          .npy file for the (N, n, m) results (created if missing)
+    prefetch    : int          number of input buffers (2 = double buffering)
+    indices     : iterable     subset of matrix indices to process (default: all)
+    flush_every : int          flush written results to disk every this many matrices
+
+    Returns
+    -------
+    stats : dict   seconds, read_wait_seconds, compute_seconds, matrices, gflops
+    """
+    shape, dtype, offset = _npy_layout(input_path)
+    if len(shape) != 3 or shape[2] != constant.shape[0]:
+        raise ValueError(f"Input stack {shape} cannot be multiplied by constant {constant.shape}")
+    num, rows, inner = shape
+    cols = constant.shape[1]
+    constant = np.ascontiguousarray(constant, dtype=dtype)
+    out_shape = (num, rows, cols)
+
+    if os.path.exists(output_path):
+        output = np.load(output_path, mmap_mode="r+")
+        if output.shape != out_shape or output.dtype != dtype:
+            raise ValueError(f"Existing output {output.shape} {output.dtype} does not match {out_shape} {dtype}")
+    else:
+        output = np.lib.format.open_memmap(output_path, mode="w+", dtype=dtype, shape=out_shape)
+
+    indices = list(range(num)) if indices is None else list(indices)
+    matrix_bytes = rows * inner * dtype.itemsize
+
+    free = queue.Queue()
+    ready = queue.Queue()
+    for _ in range(max(prefetch, 1)):
+        free.put(np.empty((rows, inner), dtype=dtype))
+    stop = threading.Event()
+    reader = threading.Thread(target=_prefetch, name="gemm-prefetch", daemon=True,
+                              args=(input_path, offset, matrix_bytes, indices, free, ready, stop))
+
+    wait_seconds = 0.0
+    compute_seconds = 0.0
+    done = 0
+    start = time.perf_counter()
+    reader.start()
+    try:
+        while True:
+            t0 = time.perf_counter()
+            item = ready.get()
+            wait_seconds += time.perf_counter() - t0
+            if item is None:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            i, buf = item
+
+            t0 = time.perf_counter()
+            np.matmul(buf, constant, out=output[i])
+            compute_seconds += time.perf_counter() - t0
+            free.put(buf)
+
+            done += 1
+            if flush_every and done % flush_every == 0:
+                output.flush()
+    finally:
+        stop.set()
+        free.put(None)                  # unblock the reader if it is waiting
+        reader.join()
+        output.flush()
+        del output
+
+    elapsed = time.perf_counter() - start
+    flops = 2.0 * rows * inner * cols * done
+    return {
+        "matrices": done,
+        "seconds": elapsed,
+        "read_wait_seconds": wait_seconds,
+        "compute_seconds": compute_seconds,
+        "gflops": flops / elapsed / 1e9 if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Out-of-core batched matrix multiplication")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="create a random input stack on disk")
+    gen.add_argument("inputs")
+    gen.add_argument("--num", type=int, default=500)
+    gen.add_argument("--size", type=int, default=5000)
+    gen.add_argument("--seed", type=int, default=None)
+
+    run = sub.add_parser("run", help="multiply every input matrix by the constant matrix")
+    run.add_argument("inputs")
+    run.add_argument("outputs")
+    run.add_argument("--constant", help=".npy file with the constant matrix (random if omitted)")
+    run.add_argument("--prefetch", type=int, default=2)
+    run.add_argument("--seed", type=int, default=None)
+
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        gb = args.num * args.size * args.size * 4 / 1e9
+        print(f"Writing {args.num} matrices of {args.size}×{args.size} ({gb:.1f} GB) to {args.inputs}...")
+        create_input_stack(args.inputs, args.num, args.size, seed=args.seed)
+        print("Done.")
+        return
+
+    shape, dtype, _ = _npy_layout(args.inputs)
+    if args.constant:
+        constant = np.load(args.constant)
+    else:
+        rng = np.random.default_rng(args.seed)
+        constant = rng.random((shape[2], shape[2]), dtype=np.float32).astype(dtype, copy=False)
+
+    print(f"Multiplying {shape[0]} matrices of {shape[1]}×{shape[2]} → {args.outputs}...")
+    stats = batched_matmul(args.inputs, constant, args.outputs, prefetch=args.prefetch)
+    print(f"Done in {stats['seconds']:.2f}s  ({stats['gflops']:.1f} GFLOP/s)")
+    print(f"  compute: {stats['compute_seconds']:.2f}s   waiting for I/O: {stats['read_wait_seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
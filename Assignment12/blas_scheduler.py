@@ -0,0 +1,297 @@
+"""
+BLAS-thread-aware scheduler for multiply_chunk-style workloads.
+
+In the notebook each of the T Python threads calls np.dot, and every np.dot
+is itself multithreaded by the BLAS library, so T threads × (all cores) BLAS
+threads oversubscribe the CPU. That, not the GIL, is what makes the timings
+jump around. This module splits the cores explicitly between
+
+    outer workers  (Python threads or processes, one chunk of matrices each)
+    BLAS threads   (threads used inside each matrix product)
+
+and searches the (workers × BLAS threads) grid to pick the fastest split for a
+given matrix size and core count.
+
+BLAS threads are limited with threadpoolctl when it is installed
+(pip install threadpoolctl). Without it, only the process backend can limit
+BLAS threads (through OMP_NUM_THREADS & co. in freshly spawned workers).
+
+Usage:
+    from blas_scheduler import autotune, run_schedule
+    best, table = autotune(random_matrices, constant_matrix)
+    results = run_schedule(best, random_matrices, constant_matrix)
+"""
+
+import os
+import time
+import contextlib
+import multiprocessing as mp
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+
+# Environment variables read by the common BLAS builds at start-up
+BLAS_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                 "BLIS_NUM_THREADS", "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+ScheduleConfig = namedtuple("ScheduleConfig", ["backend", "workers", "blas_threads"])
+
+
+def available_cpus():
+    """
+    Logical CPUs this process may run on (its affinity set), not physical
+    cores: SMT (hyper-threading) siblings count separately.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+@contextlib.contextmanager
+def blas_threads(n):
+    """Limit BLAS threads to n for the duration of the block (process-wide)."""
+    if threadpool_limits is None:
+        yield
+    else:
+        with threadpool_limits(limits=n, user_api="blas"):
+            yield
+
+
+@contextlib.contextmanager
+def _blas_env(n):
+    """Set the BLAS thread environment variables (inherited by spawned workers)."""
+    saved = {var: os.environ.get(var) for var in BLAS_ENV_VARS}
+    os.environ.update({var: str(n) for var in BLAS_ENV_VARS})
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+
+def split_indices(num_items, workers):
+    """Round-robin split of range(num_items) into `workers` chunks (as in the notebook)."""
+    indices = list(range(num_items))
+    return [indices[i::workers] for i in range(workers) if indices[i::workers]]
+
+
+# ──────────────────────────────────────────────────────────
+#  SHARED-MEMORY INPUTS (process backend)
+# ──────────────────────────────────────────────────────────
+
+class SharedStack:
+    """
+    Inputs, constant matrix and outputs placed in shared memory once, so
+    process workers can attach to them without pickling any matrix.
+    """
+
+    def __init__(self, matrices, constant):
+        first = np.asarray(matrices[0])
+        self.dtype = first.dtype
+        self.in_shape = (len(matrices),) + first.shape
+        self.const_shape = constant.shape
+        self.out_shape = (len(matrices), first.shape[0], constant.shape[1])
+
+        self._blocks = []
+        self.inputs = self._alloc(self.in_shape)
+        for i, m in enumerate(matrices):
+            self.inputs[i] = m
+        self.constant = self._alloc(self.const_shape)
+        self.constant[:] = constant
+        self.outputs = self._alloc(self.out_shape)
+
+    def _alloc(self, shape):
+        nbytes = int(np.prod(shape)) * self.dtype.itemsize
+        shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        self._blocks.append(shm)
+        return np.ndarray(shape, dtype=self.dtype, buffer=shm.buf)
+
+    def handles(self):
+        """Picklable description of the blocks for worker initializers."""
+        names = [shm.name for shm in self._blocks]
+        return (names, (self.in_shape, self.const_shape, self.out_shape), self.dtype.str)
+
+    def close(self):
+        self.inputs = self.constant = self.outputs = None
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_worker = {}
+
+
+def _process_init(handles, blas):
+    """Process-pool initializer: attach to the shared blocks, limit BLAS threads."""
+    names, shapes, dtype = handles
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    _worker["blocks"] = blocks           # keep the mappings alive
+    _worker["arrays"] = [np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+                         for shm, shape in zip(blocks, shapes)]
+    if threadpool_limits is not None:
+        _worker["limits"] = threadpool_limits(limits=blas, user_api="blas")
+
+
+def _process_multiply_chunk(indices):
+    inputs, constant, outputs = _worker["arrays"]
+    for i in indices:
+        np.matmul(inputs[i], constant, out=outputs[i])
+    return len(indices)
+
+
+# ──────────────────────────────────────────────────────────
+#  BACKENDS
+# ──────────────────────────────────────────────────────────
+
+def run_threads(matrices, constant, workers, blas, results=None):
+    """Thread backend: `workers` Python threads, each BLAS call using `blas` threads."""
+    if results is None:
+        results = [None] * len(matrices)
+
+    def multiply_chunk(indices):
+        for i in indices:
+            results[i] = np.dot(matrices[i], constant)
+
+    with blas_threads(blas):
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(multiply_chunk, split_indices(len(matrices), workers)))
+    return results
+
+
+def open_process_pool(shared, workers, blas):
+    """Start `workers` spawned processes attached to shared, each with `blas` BLAS threads."""
+    ctx = mp.get_context("spawn")
+    with _blas_env(blas):                          # read by BLAS when workers start
+        return ctx.Pool(workers, initializer=_process_init,
+                        initargs=(shared.handles(), blas))
+
+
+def run_processes(shared, workers, blas, pool=None):
+    """
+    Process backend over a SharedStack; results land in shared.outputs.
+    Pass an open pool (from open_process_pool) to reuse warm workers.
+    """
+    own_pool = pool is None
+    if own_pool:
+        pool = open_process_pool(shared, workers, blas)
+    try:
+        pool.map(_process_multiply_chunk, split_indices(shared.in_shape[0], workers))
+    finally:
+        if own_pool:
+            pool.close()
+            pool.join()
+    return shared.outputs
+
+
+def run_schedule(config, matrices, constant):
+    """Multiply every matrix by constant using config. Returns the list of results."""
+    if config.backend == "thread":
+        return run_threads(matrices, constant, config.workers, config.blas_threads)
+    with SharedStack(matrices, constant) as shared:
+        run_processes(shared, config.workers, config.blas_threads)
+        # Copy out before the shared blocks are released
+        results = [shared.outputs[i].copy() for i in range(len(matrices))]
+    return results
+
+
+# ──────────────────────────────────────────────────────────
+#  AUTOTUNING
+# ──────────────────────────────────────────────────────────
+
+def candidate_configs(cores, backends=("thread", "process")):
+    """
+    (workers × BLAS threads) splits that do not oversubscribe the cores.
+    Worker counts are the powers of two up to cores, plus cores itself, so
+    the number of pools started while autotuning grows with log(cores);
+    each worker gets either one BLAS thread or an even share of the cores.
+    """
+    worker_counts = sorted({1 << k for k in range(cores.bit_length())} | {cores})
+    configs = []
+    for backend in backends:
+        for workers in worker_counts:
+            if backend == "process" or threadpool_limits is not None:
+                choices = sorted({1, max(cores // workers, 1)})
+            else:
+                # Without threadpoolctl the thread backend cannot change BLAS threads
+                choices = [cores]
+            for blas in choices:
+                configs.append(ScheduleConfig(backend, workers, blas))
+    return configs
+
+
+def autotune(matrices, constant, cores=None, backends=("thread", "process"),
+             repeats=3, sample=None, verbose=True):
+    """
+    Time every candidate configuration and return the fastest. Each
+    configuration gets one untimed warm-up run; process pools are started
+    before timing so worker start-up is not counted.
+
+    Parameters
+    ----------
+    matrices : list of np.ndarray   the workload (or a representative sample of it)
+    constant : np.ndarray
+    cores    : int                  cores to schedule on (default: all usable)
+    backends : tuple                "thread" and/or "process"
+    repeats  : int                  timed runs per configuration (median is used)
+    sample   : int                  only time the first `sample` matrices
+
+    Returns
+    -------
+    best  : ScheduleConfig
+    table : list of (ScheduleConfig, median_seconds)
+    """
+    cores = cores or available_cpus()
+    if sample:
+        matrices = matrices[:sample]
+
+    table = []
+    shared = SharedStack(matrices, constant) if "process" in backends else None
+    try:
+        for config in candidate_configs(cores, backends):
+            pool = None
+            if config.backend == "process":
+                pool = open_process_pool(shared, config.workers, config.blas_threads)
+            try:
+                times = []
+                for run in range(repeats + 1):
+                    start = time.perf_counter()
+                    if pool is None:
+                        run_threads(matrices, constant, config.workers, config.blas_threads)
+                    else:
+                        run_processes(shared, config.workers, config.blas_threads, pool)
+                    if run:                        # run 0 is the warm-up
+                        times.append(time.perf_counter() - start)
+            finally:
+                if pool is not None:
+                    pool.close()
+                    pool.join()
+            median = float(np.median(times))
+            table.append((config, median))
+            if verbose:
+                print(f"{config.backend:<8} workers={config.workers:<3} "
+                      f"blas={config.blas_threads:<3} → {median:.4f}s")
+    finally:
+        if shared is not None:
+            shared.close()
+
+    best = min(table, key=lambda row: row[1])[0]
+    if verbose:
+        print(f"Best: {best.backend}, {best.workers} workers × {best.blas_threads} BLAS threads")
+    return best, table
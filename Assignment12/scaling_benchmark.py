@@ -0,0 +1,303 @@
+"""
+Parallel-scaling benchmark for the Assignment 12 matrix multiplication workload.
+
+Replaces the notebook's one-shot timing loop (one time.time() sample per
+thread count) with measurements that can be trusted:
+
+  - warm-up runs before timing, then repeated runs with time.perf_counter()
+  - median with a bootstrap 95 % confidence interval per configuration
+  - GFLOP/s, speedup and parallel efficiency per worker count
+  - Amdahl's-law fit (serial fraction and the speedup limit it implies)
+  - thread, process and BLAS-only backends
+  - results stored as JSON and compared against a stored baseline
+
+Usage:
+  python scaling_benchmark.py --size 1000 --num 50 --output results.json
+  python scaling_benchmark.py --baseline results.json --output new.json --plot scaling.png
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import numpy as np
+
+from blas_scheduler import (SharedStack, open_process_pool, run_processes,
+                            run_threads, available_cpus, threadpool_limits)
+
+
+BACKENDS = ("thread", "process", "blas")
+CONFIDENCE = 0.95
+BOOTSTRAP_SAMPLES = 2000
+
+
+# ──────────────────────────────────────────────────────────
+#  STATISTICS
+# ──────────────────────────────────────────────────────────
+
+def time_runs(fn, warmups, repeats):
+    """Call fn warmups times untimed, then repeats times timed. Returns seconds per run."""
+    for _ in range(warmups):
+        fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def median_ci(samples, confidence=CONFIDENCE, n_boot=BOOTSTRAP_SAMPLES, seed=0):
+    """Median and bootstrap confidence interval of samples. Returns (median, low, high)."""
+    samples = np.asarray(samples, dtype=float)
+    median = float(np.median(samples))
+    if samples.size < 2:
+        return median, median, median
+    rng = np.random.default_rng(seed)
+    resampled = rng.choice(samples, size=(n_boot, samples.size), replace=True)
+    medians = np.median(resampled, axis=1)
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(medians, [alpha, 1 - alpha])
+    return median, float(low), float(high)
+
+
+def amdahl_fit(workers, seconds):
+    """
+    Least-squares fit of Amdahl's law T(p) = T(1) · (s + (1 - s) / p).
+    Returns: (serial_fraction, speedup_limit)
+    """
+    p = np.asarray(workers, dtype=float)
+    t = np.asarray(seconds, dtype=float)
+    y = t / t[p == 1][0] if (p == 1).any() else t / t[0]
+    x = 1 - 1 / p                        # y - 1/p = s · (1 - 1/p)
+    denom = float(np.sum(x * x))
+    if denom == 0:
+        return 0.0, float("inf")
+    s = float(np.clip(np.sum((y - 1 / p) * x) / denom, 0.0, 1.0))
+    return s, (1 / s if s > 0 else float("inf"))
+
+
+# ──────────────────────────────────────────────────────────
+#  BENCHMARK
+# ──────────────────────────────────────────────────────────
+
+def _run_backend(backend, worker_counts, matrices, constant, shared, warmups, repeats):
+    """Time one backend at every worker count. Returns list of (p, times)."""
+    rows = []
+    for p in worker_counts:
+        pool = None
+        if backend == "thread":
+            # Outer threads only: one BLAS thread each so the threads do the scaling
+            fn = lambda: run_threads(matrices, constant, p, 1)
+        elif backend == "blas":
+            # A single caller; BLAS does all the parallel work
+            fn = lambda: run_threads(matrices, constant, 1, p)
+        else:
+            pool = open_process_pool(shared, p, 1)
+            fn = lambda: run_processes(shared, p, 1, pool)
+        try:
+            times = time_runs(fn, warmups, repeats)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        rows.append((p, times))
+        print(f"  {backend:<8} p={p:<3} median={np.median(times):.4f}s")
+    return rows
+
+
+def run_benchmark(size=1000, num_matrices=50, max_workers=None, warmups=2, repeats=10,
+                  backends=BACKENDS, seed=0):
+    """
+    Run the scaling benchmark.
+    Returns: results dict (JSON-serialisable), see save_results()
+    """
+    max_workers = max_workers or available_cpus()
+    worker_counts = list(range(1, max_workers + 1))
+    if threadpool_limits is None and ("thread" in backends or "blas" in backends):
+        print("Warning: threadpoolctl is not installed; BLAS thread counts cannot be "
+              "limited, so thread/blas results include BLAS oversubscription.")
+
+    rng = np.random.default_rng(seed)
+    constant = rng.random((size, size), dtype=np.float32)
+    matrices = [rng.random((size, size), dtype=np.float32) for _ in range(num_matrices)]
+    flops = 2.0 * size ** 3 * num_matrices
+
+    results = {
+        "meta": {
+            "size": size,
+            "num_matrices": num_matrices,
+            "warmups": warmups,
+            "repeats": repeats,
+            "cores": available_cpus(),
+            "numpy": np.__version__,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "backends": {},
+    }
+
+    shared = SharedStack(matrices, constant) if "process" in backends else None
+    try:
+        for backend in backends:
+            print(f"Benchmarking {backend} backend...")
+            rows = _run_backend(backend, worker_counts, matrices, constant, shared,
+                                warmups, repeats)
+            base = np.median(rows[0][1])
+            points = []
+            for p, times in rows:
+                median, low, high = median_ci(times)
+                points.append({
+                    "workers": p,
+                    "times": times,
+                    "median": median,
+                    "ci_low": low,
+                    "ci_high": high,
+                    "gflops": flops / median / 1e9,
+                    "speedup": base / median,
+                    "efficiency": base / median / p,
+                })
+            serial, limit = amdahl_fit([pt["workers"] for pt in points],
+                                       [pt["median"] for pt in points])
+            results["backends"][backend] = {
+                "points": points,
+                "amdahl": {"serial_fraction": serial, "speedup_limit": limit},
+            }
+    finally:
+        if shared is not None:
+            shared.close()
+    return results
+
+
+# ──────────────────────────────────────────────────────────
+#  REPORTING
+# ──────────────────────────────────────────────────────────
+
+def print_report(results):
+    meta = results["meta"]
+    print(f"\n{meta['num_matrices']} × {meta['size']}×{meta['size']} float32, "
+          f"{meta['cores']} cores, median of {meta['repeats']} runs ({CONFIDENCE:.0%} CI)")
+    for backend, data in results["backends"].items():
+        print(f"\n[{backend}]")
+        print(f"  {'p':>3} {'median (s)':>11} {'CI':>21} {'GFLOP/s':>9} {'speedup':>8} {'eff.':>6}")
+        for pt in data["points"]:
+            ci = f"[{pt['ci_low']:.4f}, {pt['ci_high']:.4f}]"
+            print(f"  {pt['workers']:>3} {pt['median']:>11.4f} {ci:>21} {pt['gflops']:>9.1f} "
+                  f"{pt['speedup']:>8.2f} {pt['efficiency']:>6.0%}")
+        fit = data["amdahl"]
+        print(f"  Amdahl fit: serial fraction {fit['serial_fraction']:.3f}, "
+              f"speedup limit {fit['speedup_limit']:.1f}×")
+
+
+def save_results(results, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results, baseline, tolerance=0.05):
+    """
+    Compare results with a baseline run. A configuration counts as a
+    regression (or improvement) only if its median moved by more than
+    `tolerance` AND the confidence intervals do not overlap.
+    Returns: list of (backend, workers, ratio, status)
+    """
+    rows = []
+    for backend, data in results["backends"].items():
+        if backend not in baseline.get("backends", {}):
+            continue
+        base_points = {pt["workers"]: pt for pt in baseline["backends"][backend]["points"]}
+        for pt in data["points"]:
+            base = base_points.get(pt["workers"])
+            if base is None:
+                continue
+            ratio = pt["median"] / base["median"]
+            if ratio > 1 + tolerance and pt["ci_low"] > base["ci_high"]:
+                status = "REGRESSION"
+            elif ratio < 1 - tolerance and pt["ci_high"] < base["ci_low"]:
+                status = "improved"
+            else:
+                status = "same"
+            rows.append((backend, pt["workers"], ratio, status))
+
+    if baseline.get("meta", {}).get("size") != results["meta"]["size"]:
+        print("Warning: baseline was measured with a different matrix size.")
+    print("\nComparison with baseline (time ratio, >1 = slower):")
+    for backend, p, ratio, status in rows:
+        print(f"  {backend:<8} p={p:<3} {ratio:6.3f}  {status}")
+    return rows
+
+
+def plot(results, path):
+    """Save median time (with CI error bars) and speedup vs workers for every backend."""
+    import matplotlib.pyplot as plt
+
+    fig, (ax_t, ax_s) = plt.subplots(1, 2, figsize=(12, 5))
+    for backend, data in results["backends"].items():
+        pts = data["points"]
+        p = [pt["workers"] for pt in pts]
+        med = np.array([pt["median"] for pt in pts])
+        err = [med - [pt["ci_low"] for pt in pts], [pt["ci_high"] for pt in pts] - med]
+        ax_t.errorbar(p, med, yerr=err, marker="o", capsize=3, label=backend)
+        ax_s.plot(p, [pt["speedup"] for pt in pts], marker="o", label=backend)
+    max_p = max(pt["workers"] for d in results["backends"].values() for pt in d["points"])
+    ax_s.plot([1, max_p], [1, max_p], linestyle="--", color="grey", label="ideal")
+
+    ax_t.set_title("Execution Time vs Workers (median, 95% CI)", fontweight="bold")
+    ax_t.set_xlabel("Workers")
+    ax_t.set_ylabel("Time (s)")
+    ax_s.set_title("Speedup vs Workers", fontweight="bold")
+    ax_s.set_xlabel("Workers")
+    ax_s.set_ylabel("Speedup")
+    for ax in (ax_t, ax_s):
+        ax.grid(True, linestyle="--", alpha=0.5)
+        ax.legend()
+    plt.tight_layout()
+    plt.savefig(path, dpi=150)
+    print(f"Plot saved as {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel-scaling benchmark for batched matmul")
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--num", type=int, default=50)
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--warmups", type=int, default=2)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--backends", default=",".join(BACKENDS),
+                        help="comma-separated subset of: " + ", ".join(BACKENDS))
+    parser.add_argument("--output", default="scaling_results.json")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.05)
+    parser.add_argument("--plot", help="save a PNG plot to this path")
+    args = parser.parse_args()
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    unknown = set(backends) - set(BACKENDS)
+    if unknown:
+        parser.error(f"unknown backend(s): {', '.join(sorted(unknown))}")
+
+    results = run_benchmark(args.size, args.num, args.max_workers, args.warmups,
+                            args.repeats, backends)
+    print_report(results)
+    save_results(results, args.output)
+    print(f"\nResults saved to {args.output}")
+
+    if args.plot:
+        plot(results, args.plot)
+
+    if args.baseline:
+        rows = compare(results, load_results(args.baseline), args.tolerance)
+        if any(status == "REGRESSION" for *_, status in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
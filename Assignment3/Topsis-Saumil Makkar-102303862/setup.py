@@ -5,7 +5,7 @@ with open("README.md", "r", encoding="utf-8") as fh:
 
 setup(
     name="Topsis-Saumil-102303862",  
-    version="1.0.2",
+    version="1.2.0",
     author="Saumil Makkar",
     author_email="saumilmakkar@example.com",  
     description="A Python package for TOPSIS (Technique for Order of Preference by Similarity to Ideal Solution) multi-criteria decision analysis",
@@ -32,9 +32,13 @@ setup(
     install_requires=[
         "pandas>=1.0.0",
     ],
+    extras_require={
+        "parquet": ["pyarrow>=8.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "topsis=topsis.topsis:main",
+            "topsis-client=topsis.client:main",
         ],
     },
     keywords="topsis, mcdm, decision-making, multi-criteria, optimization",
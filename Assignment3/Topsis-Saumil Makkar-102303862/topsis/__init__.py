@@ -8,6 +8,10 @@ Similarity to Ideal Solution) multi-criteria decision analysis.
 Usage:
     Command Line:
         topsis <InputDataFile> <Weights> <Impacts> <OutputResultFileName>
+
+    Persistent server (for many small calls):
+        topsis serve
+        topsis-client <InputDataFile> <Weights> <Impacts> <OutputResultFileName>
     
     Python:
         from topsis.topsis import topsis
@@ -18,10 +22,19 @@ GitHub: https://github.com/SaumilMakkar/UCS654
 License: MIT
 """
 
-__version__ = "1.0.2"
+__version__ = "1.2.0"
 __author__ = "Saumil Makkar"
 __email__ = "saumilmakkar@example.com"
 
-from topsis.topsis import topsis, main
-
 __all__ = ["topsis", "main"]
+
+
+def __getattr__(name):
+    # Loaded on first use so that `topsis.client` starts without numpy/pandas
+    if name in __all__:
+        import importlib
+        module = importlib.import_module("topsis.topsis")
+        # Importing the submodule binds `topsis` to it; rebind the public names
+        globals().update(topsis=module.topsis, main=module.main)
+        return globals()[name]
+    raise AttributeError(f"module 'topsis' has no attribute {name!r}")
@@ -0,0 +1,83 @@
+"""
+============================================================
+TOPSIS client – forwards a command to a running `topsis serve`
+============================================================
+Usage (same arguments as the topsis command):
+  topsis-client data.csv "1,1,1,2" "+,+,-,+" output-result.csv
+
+The arguments and the current directory are sent to the server, whose
+captured output is printed and whose exit code is returned. If no server
+is running, the command runs in this process instead, so the result is the
+same either way – only slower.
+============================================================
+"""
+
+import os
+import sys
+import json
+import socket
+
+
+def default_socket_path():
+    env = os.environ.get("TOPSIS_SOCKET")
+    if env:
+        return env
+    import tempfile
+    uid = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return os.path.join(tempfile.gettempdir(), f"topsis-{uid}.sock")
+
+
+class ServerUnavailable(OSError):
+    """No TOPSIS server is listening on the socket."""
+
+
+def request(argv, path=None, cwd=None):
+    """
+    Send one command to the server.
+    Returns: (stdout, stderr, exit_code)
+    Raises: ServerUnavailable if the socket cannot be connected, OSError if the
+            connection fails afterwards, ValueError for a malformed reply.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise ServerUnavailable("Unix domain sockets are not available")
+    payload = json.dumps({"argv": list(argv), "cwd": cwd or os.getcwd()}) + "\n"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path or default_socket_path())
+        except OSError as e:
+            raise ServerUnavailable(str(e)) from e
+        sock.sendall(payload.encode("utf-8"))
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise OSError("TOPSIS server closed the connection without a reply")
+    try:
+        reply = json.loads(line)
+        return str(reply["stdout"]), str(reply["stderr"]), int(reply["exit_code"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Malformed reply from TOPSIS server: {line[:80]!r}") from e
+
+
+def main():
+    """Console entry point of topsis-client."""
+    argv = sys.argv[1:]
+    try:
+        stdout, stderr, code = request(argv)
+    except ServerUnavailable:
+        # No server: run the normal command in-process
+        from topsis.topsis import main as topsis_main
+        sys.argv = ["topsis"] + argv
+        topsis_main()
+        return
+    except (OSError, ValueError) as e:
+        # The server took the command, so running it again here could repeat it
+        print(f"Error: {e}")
+        sys.exit(1)
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    sys.stdout.flush()
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+============================================================
+Columnar (Parquet / Arrow IPC) input and output for TOPSIS
+============================================================
+Needs pyarrow:  pip install "Topsis-Saumil-102303862[parquet]"
+
+Formats (by extension):
+  .parquet / .pq             Parquet
+  .arrow / .feather / .ipc   Arrow IPC *file* format (= Feather v2)
+The Arrow IPC stream format and Feather v1 files are not supported.
+
+Files are read with column projection, so only the name column (the first
+column) and the chosen criteria columns are loaded. Numeric columns become
+NumPy arrays without copying where the data allows (float64 without nulls);
+other numeric types are converted once to float64.
+
+Problems with the input (missing pyarrow, unreadable file, unknown or
+non-numeric column) raise ValueError; the topsis command prints them as
+"Error: ..." and exits with status 1.
+============================================================
+"""
+
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+
+def available():
+    """True when pyarrow is installed."""
+    return pa is not None
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ValueError("Parquet / Arrow files need pyarrow. "
+                         "Install it with: pip install \"Topsis-Saumil-102303862[parquet]\"")
+
+
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in PARQUET_EXTENSIONS
+
+
+def column_names(path):
+    """Column names of a Parquet / Arrow file, read from the schema only."""
+    _require_pyarrow()
+    try:
+        if _is_parquet(path):
+            return list(pq.read_schema(path).names)
+        with pa.memory_map(path) as source:
+            return list(pa.ipc.open_file(source).schema.names)
+    except (pa.ArrowInvalid, OSError) as e:
+        kind = "Parquet" if _is_parquet(path) else "Arrow IPC file (Feather v2)"
+        raise ValueError(f"Cannot read '{path}' as {kind}: {e}")
+
+
+def read_table(path, columns=None):
+    """Read (a projection of) a Parquet / Arrow file, memory-mapped."""
+    _require_pyarrow()
+    try:
+        if _is_parquet(path):
+            return pq.read_table(path, columns=columns, memory_map=True)
+        return feather.read_table(path, columns=columns, memory_map=True)
+    except (pa.ArrowInvalid, OSError) as e:
+        raise ValueError(f"Cannot read '{path}': {e}")
+
+
+def _to_float_array(column, name):
+    """ChunkedArray → float64 NumPy array (zero-copy for float64 without nulls)."""
+    if not (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)):
+        raise ValueError(f"Non-numeric column '{name}' (type {column.type}).")
+    if column.null_count:
+        raise ValueError(f"Column '{name}' has {column.null_count} missing value(s).")
+    array = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+    values = array.to_numpy(zero_copy_only=False)
+    return values if values.dtype == "float64" else values.astype("float64")
+
+
+def read_columnar(path, criteria=None):
+    """
+    Read the name column and the criteria columns (all columns after the
+    first when criteria is None).
+    Returns: header (list), names (pyarrow Array), columns (list of float64 arrays)
+    """
+    names_all = column_names(path)
+    if not names_all:
+        raise ValueError("Input file has no columns.")
+    name_col = names_all[0]
+    criteria = list(criteria) if criteria else names_all[1:]
+    for c in criteria:
+        if c not in names_all:
+            raise ValueError(f"Column '{c}' not found in input file.")
+
+    header = [name_col] + criteria
+    table = read_table(path, columns=header)
+    if table.num_rows < 1:
+        raise ValueError("Input file must have a header and at least one data row.")
+    names = table.column(name_col).combine_chunks()
+    columns = [_to_float_array(table.column(c), c) for c in criteria]
+    return header, names, columns
+
+
+def _write_table(table, path):
+    if _is_parquet(path):
+        pq.write_table(table, path)
+    else:
+        feather.write_feather(table, path)
+
+
+def write_columnar(path, header, names, columns, scores, ranks, mode="full"):
+    """
+    Write results as Parquet / Arrow (format from the extension).
+    mode "full"   : name + criteria columns + Topsis Score + Rank
+         "scores" : name + Topsis Score + Rank
+    """
+    _require_pyarrow()
+    arrays = [pa.array(names) if not isinstance(names, (pa.Array, pa.ChunkedArray)) else names]
+    fields = [header[0]]
+    if mode == "full":
+        arrays += [pa.array(col) for col in columns]
+        fields += list(header[1:])
+    arrays += [pa.array(scores, type=pa.float64()), pa.array(ranks, type=pa.int64())]
+    fields += ["Topsis Score", "Rank"]
+    _write_table(pa.table(arrays, names=fields), path)
+
+
+def append_columnar(in_path, out_path, scores, ranks):
+    """Copy every original column of in_path (as stored) and add Topsis Score / Rank."""
+    table = read_table(in_path)
+    table = table.append_column("Topsis Score", pa.array(scores, type=pa.float64()))
+    table = table.append_column("Rank", pa.array(ranks, type=pa.int64()))
+    _write_table(table, out_path)
@@ -0,0 +1,177 @@
+"""
+============================================================
+TOPSIS daemon – keeps warm worker processes on a Unix socket
+============================================================
+Usage:
+  topsis serve [--socket PATH] [--workers N]
+
+Each request is one JSON line {"argv": [...], "cwd": "..."}; it runs the
+normal command-line main() in a worker process, inside the caller's working
+directory, with stdout / stderr captured and sys.exit() turned into an exit
+code. The reply is one JSON line {"stdout", "stderr", "exit_code"}, so the
+client (topsis.client) reproduces the exact messages and exit codes of the
+`topsis` command.
+============================================================
+"""
+
+import os
+import io
+import sys
+import json
+import signal
+import socket
+import argparse
+import tempfile
+import traceback
+import contextlib
+import socketserver
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+
+def default_socket_path():
+    """$TOPSIS_SOCKET, or a per-user socket in the temp directory."""
+    env = os.environ.get("TOPSIS_SOCKET")
+    if env:
+        return env
+    uid = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return os.path.join(tempfile.gettempdir(), f"topsis-{uid}.sock")
+
+
+# ──────────────────────────────────────────────────────────
+#  WORKER SIDE
+# ──────────────────────────────────────────────────────────
+
+def run_request(argv, cwd):
+    """
+    Run topsis main() as if invoked as `topsis <argv...>` from cwd.
+    Returns: (stdout, stderr, exit_code)
+    """
+    from topsis.topsis import main
+
+    if argv and argv[0] == "serve":
+        # A nested daemon would block this worker forever
+        return ("Error: 'serve' cannot be sent to a TOPSIS server.\n"
+                "Usage : topsis <InputFile> <Weights> <Impacts> <OutputFile>\n", "", 1)
+
+    out, err = io.StringIO(), io.StringIO()
+    saved_argv, saved_cwd = sys.argv, os.getcwd()
+    code = 0
+    try:
+        os.chdir(cwd)
+        sys.argv = ["topsis"] + list(argv)
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                main()
+            except SystemExit as e:
+                # Same conversion as the interpreter does for sys.exit(arg)
+                if e.code is None:
+                    code = 0
+                elif isinstance(e.code, int):
+                    code = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    code = 1
+            except Exception:
+                traceback.print_exc()
+                code = 1
+    except OSError as e:
+        err.write(f"Error: cannot use working directory '{cwd}': {e}\n")
+        code = 1
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+    return out.getvalue(), err.getvalue(), code
+
+
+def _worker_init():
+    # Ctrl+C is handled by the server process, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    import topsis.topsis  # noqa: F401  (warm the import)
+
+
+# ──────────────────────────────────────────────────────────
+#  SERVER SIDE
+# ──────────────────────────────────────────────────────────
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            argv = [str(a) for a in request["argv"]]
+            cwd = str(request["cwd"])
+        except (ValueError, KeyError, TypeError):
+            reply = {"stdout": "", "stderr": "Error: malformed request.\n", "exit_code": 2}
+        else:
+            try:
+                stdout, stderr, code = self.server.pool.submit(run_request, argv, cwd).result()
+                reply = {"stdout": stdout, "stderr": stderr, "exit_code": code}
+            except Exception as e:        # e.g. a worker process died
+                reply = {"stdout": "", "stderr": f"Error: TOPSIS server failure: {e}\n",
+                         "exit_code": 1}
+        self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+
+
+class TopsisServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """One thread per connection; the threads hand the work to a process pool."""
+    daemon_threads = True
+
+    def __init__(self, path, workers):
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"),
+                                        initializer=_worker_init)
+        # Create the socket as 0600 from the start (no window with umask permissions)
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(path, _Handler)
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def _socket_in_use(path):
+    """True if a server is already accepting on path (stale files return False)."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def serve(argv=None):
+    """Entry point of `topsis serve`."""
+    parser = argparse.ArgumentParser(prog="topsis serve",
+                                     description="Run a persistent TOPSIS server")
+    parser.add_argument("--socket", default=default_socket_path())
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: topsis serve needs Unix domain sockets, which this platform lacks.")
+        sys.exit(1)
+    if os.path.exists(args.socket):
+        if _socket_in_use(args.socket):
+            print(f"Error: a TOPSIS server is already listening on '{args.socket}'.")
+            sys.exit(1)
+        os.remove(args.socket)
+
+    server = TopsisServer(args.socket, max(1, args.workers))
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"TOPSIS server listening on '{args.socket}' with {args.workers} workers.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        print("TOPSIS server stopped.")
@@ -5,9 +5,15 @@ TOPSIS – Technique for Order of Preference by
 ============================================================
 Usage:
   python topsis.py <InputDataFile> <Weights> <Impacts> <OutputResultFileName>
+                   [--criteria C1,C2,...] [--output-mode full|scores|append]
+  topsis serve [--socket PATH] [--workers N]     (persistent server, see server.py)
+
+Input and output files may be CSV, Parquet (.parquet / .pq) or Arrow IPC
+(.arrow / .feather / .ipc); Parquet and Arrow need pyarrow (see columnar.py).
 
 Example:
   python topsis.py data.csv "1,1,1,2" "+,+,-,+" output-result.csv
+  python topsis.py wide.parquet "1,1,2" "+,-,+" ranks.parquet --criteria P1,P4,P7 --output-mode scores
 ============================================================
 """
 
@@ -21,9 +27,52 @@ import math
 #  VALIDATION HELPERS
 # ──────────────────────────────────────────────────────────
 
-def check_argument_count():
+OUTPUT_MODES = ("full", "scores", "append")
+COLUMNAR_EXTENSIONS = (".parquet", ".pq", ".arrow", ".feather", ".ipc")
+
+
+def is_columnar(path):
+    """Parquet / Arrow file (by extension); everything else is read as CSV."""
+    return os.path.splitext(path)[1].lower() in COLUMNAR_EXTENSIONS
+
+
+def parse_options(args):
+    """
+    Split --criteria / --output-mode (either "--opt value" or "--opt=value")
+    from the positional arguments.
+    Returns: positional (list), options (dict)
+    """
+    options = {"criteria": None, "output_mode": "full"}
+    positional = []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        name, _, value = arg.partition("=")
+        if name in ("--criteria", "--output-mode"):
+            if not _:
+                if i + 1 >= len(args):
+                    print(f"Error: {name} needs a value.")
+                    sys.exit(1)
+                i += 1
+                value = args[i]
+            options[name[2:].replace("-", "_")] = value
+        else:
+            positional.append(arg)
+        i += 1
+
+    if options["output_mode"] not in OUTPUT_MODES:
+        print(f"Error: Invalid output mode '{options['output_mode']}'. "
+              f"Use one of: {', '.join(OUTPUT_MODES)}.")
+        sys.exit(1)
+    if options["criteria"] is not None:
+        options["criteria"] = [c.strip() for c in options["criteria"].split(",") if c.strip()]
+    return positional, options
+
+
+def check_argument_count(args=None):
     """Exactly 4 arguments must follow the script name."""
-    if len(sys.argv) != 5:
+    count = len(sys.argv) - 1 if args is None else len(args)
+    if count != 4:
         print("Error: Incorrect number of parameters.")
         print("Usage : topsis <InputFile> <Weights> <Impacts> <OutputFile>")
         print("Example: topsis data.csv \"1,1,1,2\" \"+,+,-,+\" result.csv")
@@ -47,6 +96,27 @@ def read_input(path):
     return rows[0], rows[1:]
 
 
+def project_columns(header, data_rows, criteria):
+    """Keep the name column and the named criteria columns, in the given order."""
+    index = {name.strip(): i for i, name in enumerate(header)}
+    for c in criteria:
+        if c not in index:
+            print(f"Error: Column '{c}' not found in input file.")
+            sys.exit(1)
+    keep = [0] + [index[c] for c in criteria]
+    return ([header[i] for i in keep],
+            [[row[i] if i < len(row) else "" for i in keep] for row in data_rows])
+
+
+def columnar_call(func, *args):
+    """Run a topsis.columnar function, turning its ValueError into the usual error exit."""
+    try:
+        return func(*args)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
 def check_min_columns(header):
     if len(header) < 3:
         print("Error: Input file must contain three or more columns "
@@ -169,6 +239,52 @@ def topsis(matrix, weights, impacts):
     return scores, ranks
 
 
+def topsis_numpy(columns, weights, impacts):
+    """
+    Vectorised TOPSIS over criteria columns; same results as topsis().
+
+    Parameters
+    ----------
+    columns : sequence of 1-D float arrays, one per criterion
+              (or a 2-D array of shape (n_alternatives, n_criteria))
+    weights : list[float]
+    impacts : list[str]   '+' or '-'
+
+    Returns
+    -------
+    scores  : list[float]   TOPSIS score (0-100) per alternative
+    ranks   : list[int]     rank (1 = best)
+    """
+    import numpy as np
+
+    if isinstance(columns, np.ndarray) and columns.ndim == 2:
+        columns = columns.T
+    rows = len(columns[0])
+    s_pos = np.zeros(rows)
+    s_neg = np.zeros(rows)
+
+    # One criterion at a time: no (rows × criteria) temporaries
+    for col, w, impact in zip(columns, weights, impacts):
+        col = np.asarray(col, dtype=np.float64)
+        denom = np.sqrt(np.dot(col, col))
+        v = (col / denom) * w if denom != 0 else np.zeros(rows)
+        best, worst = (v.max(), v.min()) if impact == "+" else (v.min(), v.max())
+        s_pos += (v - best) ** 2
+        s_neg += (v - worst) ** 2
+    s_pos = np.sqrt(s_pos)
+    s_neg = np.sqrt(s_neg)
+
+    total = s_pos + s_neg
+    raw = np.divide(s_neg, total, out=np.zeros(rows), where=total != 0) * 100
+    # Python's round() keeps scores identical to topsis()
+    scores = [round(x, 2) if t != 0 else 0.0 for x, t in zip(raw.tolist(), total.tolist())]
+
+    order = np.argsort(-np.asarray(scores), kind="stable")
+    ranks = np.empty(rows, dtype=np.int64)
+    ranks[order] = np.arange(1, rows + 1)
+    return scores, ranks.tolist()
+
+
 # ──────────────────────────────────────────────────────────
 #  OUTPUT
 # ──────────────────────────────────────────────────────────
@@ -182,6 +298,54 @@ def write_output(header, names, matrix, scores, ranks, out_path):
             writer.writerow(row)
 
 
+def write_scores(name_header, names, scores, ranks, out_path):
+    """Output mode "scores": only name, Topsis Score and Rank."""
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([name_header, "Topsis Score", "Rank"])
+        for i in range(len(names)):
+            writer.writerow([names[i], scores[i], ranks[i]])
+
+
+def _records_with_lines(f):
+    """Yield (row, raw_text) for every CSV record, raw_text exactly as in the file."""
+    consumed = []
+
+    def lines():
+        for line in f:
+            consumed.append(line)
+            yield line
+
+    for row in csv.reader(lines()):        # csv.reader pulls one record at a time
+        raw = "".join(consumed)
+        consumed.clear()
+        yield row, raw
+
+
+def append_output(in_path, scores, ranks, out_path):
+    """
+    Output mode "append" for CSV: every original line is copied verbatim
+    with ",<Topsis Score>,<Rank>" added before its line ending.
+    """
+    data = iter(zip(scores, ranks))
+    with open(in_path, newline="", encoding="utf-8") as src, \
+            open(out_path, "w", newline="", encoding="utf-8") as dst:
+        header_done = False
+        for row, raw in _records_with_lines(src):
+            if not any(cell.strip() for cell in row):
+                dst.write(raw)                      # blank line: keep as is
+                continue
+            body = raw.rstrip("\r\n")
+            ending = raw[len(body):]
+            if not header_done:
+                extra = ",Topsis Score,Rank"
+                header_done = True
+            else:
+                score, rank = next(data)
+                extra = f",{score},{rank}"
+            dst.write(body + extra + (ending or ""))
+
+
 # ──────────────────────────────────────────────────────────
 #  MAIN
 # ──────────────────────────────────────────────────────────
@@ -190,25 +354,44 @@ def main():
     """
     Main entry point for command-line usage.
     """
-    # 1. argument count
-    check_argument_count()
+    # `topsis serve ...` starts the persistent server instead
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from topsis.server import serve
+        serve(sys.argv[2:])
+        return
+
+    # 1. options & argument count
+    positional, options = parse_options(sys.argv[1:])
+    check_argument_count(positional)
 
-    input_file  = sys.argv[1]
-    weight_str  = sys.argv[2]
-    impact_str  = sys.argv[3]
-    output_file = sys.argv[4]
+    input_file, weight_str, impact_str, output_file = positional
+    criteria = options["criteria"]
+    mode = options["output_mode"]
 
     # 2. file exists
     check_file_exists(input_file)
 
-    # 3. read CSV
-    header, data_rows = read_input(input_file)
+    columnar_in, columnar_out = is_columnar(input_file), is_columnar(output_file)
+    if mode == "append" and columnar_in != columnar_out:
+        print("Error: --output-mode append needs the output in the same format as the input.")
+        sys.exit(1)
 
-    # 4. >= 3 columns
-    check_min_columns(header)
+    if columnar_in:
+        # 3-5. read only the name + criteria columns as float arrays
+        from topsis.columnar import read_columnar
+        header, names, columns = columnar_call(read_columnar, input_file, criteria)
+        check_min_columns(header)
+    else:
+        # 3. read CSV
+        header, data_rows = read_input(input_file)
+        if criteria:
+            header, data_rows = project_columns(header, data_rows, criteria)
 
-    # 5. numeric check on criteria columns
-    check_numeric(data_rows)
+        # 4. >= 3 columns
+        check_min_columns(header)
+
+        # 5. numeric check on criteria columns
+        check_numeric(data_rows)
 
     # 6. derive counts
     n_criteria = len(header) - 1
@@ -217,15 +400,34 @@ def main():
     weights = parse_weights(weight_str, n_criteria)
     impacts = parse_impacts(impact_str, n_criteria)
 
-    # 8. build numeric matrix & name list
-    names  = [row[0].strip() for row in data_rows]
-    matrix = [[float(row[c]) for c in range(1, len(row))] for row in data_rows]
-
-    # 9. run TOPSIS
-    scores, ranks = topsis(matrix, weights, impacts)
+    # 8-9. build numeric matrix & name list, run TOPSIS
+    if columnar_in:
+        scores, ranks = topsis_numpy(columns, weights, impacts)
+    else:
+        names  = [row[0].strip() for row in data_rows]
+        matrix = [[float(row[c]) for c in range(1, len(row))] for row in data_rows]
+        scores, ranks = topsis(matrix, weights, impacts)
 
     # 10. save
-    write_output(header, names, matrix, scores, ranks, output_file)
+    if mode == "append":
+        if columnar_in:
+            from topsis.columnar import append_columnar
+            columnar_call(append_columnar, input_file, output_file, scores, ranks)
+        else:
+            append_output(input_file, scores, ranks, output_file)
+    elif columnar_out:
+        from topsis.columnar import write_columnar
+        if not columnar_in:
+            columns = list(zip(*matrix)) if matrix else []
+        columnar_call(write_columnar, output_file, header, names, columns, scores, ranks, mode)
+    else:
+        if columnar_in:
+            names = [str(n) for n in names.to_pylist()]
+            matrix = [list(r) for r in zip(*(c.tolist() for c in columns))]
+        if mode == "scores":
+            write_scores(header[0], names, scores, ranks, output_file)
+        else:
+            write_output(header, names, matrix, scores, ranks, output_file)
     print(f"TOPSIS completed. Results saved to '{output_file}'.")
 
 
@@ -6,6 +6,7 @@ Flask application for TOPSIS analysis with email results
 from flask import Flask, render_template, request, flash, redirect, url_for
 from werkzeug.utils import secure_filename
 import os
+import sys
 import csv
 import math
 import smtplib
@@ -15,6 +16,15 @@ from email.mime.base import MIMEBase
 from email import encoders
 import re
 
+# Parquet / Arrow I/O and the vectorised TOPSIS come from the topsis package
+# (pip install Topsis-Saumil-102303862); the copy in this repository is used when present
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                           "Topsis-Saumil Makkar-102303862")
+if os.path.isdir(PACKAGE_DIR):
+    sys.path.insert(0, PACKAGE_DIR)
+from topsis import columnar
+from topsis.topsis import OUTPUT_MODES, is_columnar, topsis_numpy, write_scores, append_output
+
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here-change-this'
 app.config['UPLOAD_FOLDER'] = 'uploads'
@@ -39,8 +49,15 @@ def validate_email(email):
 
 
 def validate_file(filename):
-    """Check if file is CSV"""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() == 'csv'
+    """Check if file is CSV (or Parquet / Arrow when pyarrow is installed)"""
+    if '.' in filename and filename.rsplit('.', 1)[1].lower() == 'csv':
+        return True
+    return columnar.available() and is_columnar(filename)
+
+
+def parse_criteria(criteria_str):
+    """Optional comma-separated criteria column names (empty → all columns)"""
+    return [c.strip() for c in criteria_str.split(",") if c.strip()] or None
 
 
 def read_csv_file(filepath):
@@ -55,6 +72,21 @@ def read_csv_file(filepath):
     return rows[0], rows[1:]
 
 
+def project_columns(header, data_rows, criteria):
+    """Keep the name column and the selected criteria columns"""
+    index = {name.strip(): i for i, name in enumerate(header)}
+    for c in criteria:
+        if c not in index:
+            raise ValueError(f"Column '{c}' not found in the file")
+    keep = [0] + [index[c] for c in criteria]
+    projected = []
+    for r_idx, row in enumerate(data_rows, start=2):
+        if len(row) != len(header):
+            raise ValueError(f"Row {r_idx} has {len(row)} columns, expected {len(header)}")
+        projected.append([row[i] for i in keep])
+    return [header[i] for i in keep], projected
+
+
 def validate_csv_data(header, data_rows):
     """Validate CSV structure and data"""
     if len(header) < 3:
@@ -223,6 +255,8 @@ def analyze():
         weights_str = request.form.get('weights', '').strip()
         impacts_str = request.form.get('impacts', '').strip()
         email = request.form.get('email', '').strip()
+        criteria = parse_criteria(request.form.get('criteria', ''))
+        output_mode = request.form.get('output_mode', 'full')
         
         # Validate inputs
         if not file or file.filename == '':
@@ -230,7 +264,14 @@ def analyze():
             return redirect(url_for('index'))
         
         if not validate_file(file.filename):
-            flash('File must be a CSV file', 'error')
+            if not columnar.available():
+                flash('File must be a CSV file', 'error')
+            else:
+                flash('File must be a CSV, Parquet or Arrow file', 'error')
+            return redirect(url_for('index'))
+
+        if output_mode not in OUTPUT_MODES:
+            flash('Invalid output mode', 'error')
             return redirect(url_for('index'))
         
         if not weights_str:
@@ -254,9 +295,18 @@ def analyze():
         input_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         file.save(input_path)
         
-        # Read and validate CSV
-        header, data_rows = read_csv_file(input_path)
-        validate_csv_data(header, data_rows)
+        columnar_file = is_columnar(filename)
+        if columnar_file:
+            # Read only the name and criteria columns
+            header, names, columns = columnar.read_columnar(input_path, criteria)
+            if len(header) < 3:
+                raise ValueError("File must have at least 3 columns (1 name + 2 criteria)")
+        else:
+            # Read and validate CSV
+            header, data_rows = read_csv_file(input_path)
+            if criteria:
+                header, data_rows = project_columns(header, data_rows, criteria)
+            validate_csv_data(header, data_rows)
         
         n_criteria = len(header) - 1
         
@@ -269,17 +319,32 @@ def analyze():
             flash('Number of weights must equal number of impacts', 'error')
             return redirect(url_for('index'))
         
-        # Extract data
-        names = [row[0].strip() for row in data_rows]
-        matrix = [[float(row[c]) for c in range(1, len(row))] for row in data_rows]
-        
-        # Run TOPSIS
-        scores, ranks = topsis(matrix, weights, impacts)
-        
-        # Write results
         result_filename = f"result_{filename}"
         result_path = os.path.join(app.config['RESULT_FOLDER'], result_filename)
-        write_result_csv(header, names, matrix, scores, ranks, result_path)
+
+        if columnar_file:
+            # Run TOPSIS on the column arrays and write in the same format
+            scores, ranks = topsis_numpy(columns, weights, impacts)
+            if output_mode == "append":
+                columnar.append_columnar(input_path, result_path, scores, ranks)
+            else:
+                columnar.write_columnar(result_path, header, names, columns, scores, ranks,
+                                        output_mode)
+        else:
+            # Extract data
+            names = [row[0].strip() for row in data_rows]
+            matrix = [[float(row[c]) for c in range(1, len(row))] for row in data_rows]
+            
+            # Run TOPSIS
+            scores, ranks = topsis(matrix, weights, impacts)
+            
+            # Write results
+            if output_mode == "scores":
+                write_scores(header[0], names, scores, ranks, result_path)
+            elif output_mode == "append":
+                append_output(input_path, scores, ranks, result_path)
+            else:
+                write_result_csv(header, names, matrix, scores, ranks, result_path)
         
         # Send email
         email_sent = send_email(email, result_path)
@@ -0,0 +1,288 @@
+"""
+Length-bucketed batched inference for the text-classification comparison.
+
+The notebook calls clf(texts) on the whole list, so short and long sentences
+are padded to the same length, and it rebuilds every pipeline() for each run.
+This runner:
+
+  - sorts the inputs by token length and cuts the sorted list into batches
+    whose padded size (batch rows × longest row) stays under a token budget,
+    so short sentences go in big batches and long ones in small batches
+  - runs the model directly under torch.inference_mode() (no pipeline
+    pre/post-processing per item) and returns pipeline-style
+    {"label", "score"} dicts in the original input order
+  - keeps loaded tokenizers / models in a per-process cache, so repeated runs
+    skip the load
+  - sets the torch CPU thread count, and can split the batches over several
+    worker processes (each with its share of the cores)
+
+model_name may be a Hugging Face hub id or a local directory, so a tiny
+locally stored model is enough for quick checks.
+
+Usage:
+  python inference_runner.py --model distilbert/distilbert-base-uncased-finetuned-sst-2-english --num 872
+  python inference_runner.py --model ./tiny-model --texts sentences.txt --processes 2
+"""
+
+import os
+import time
+import argparse
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+
+MAX_TOKENS = 8192           # padded tokens per batch (rows × longest row)
+MAX_BATCH = 128             # rows per batch, however short the sentences
+MAX_LENGTH = 512            # truncation length
+
+
+# ──────────────────────────────────────────────────────────
+#  MODEL CACHE
+# ──────────────────────────────────────────────────────────
+
+_TOKENIZERS = {}
+_MODELS = {}
+
+
+def load_tokenizer(model_name):
+    """Tokenizer for model_name, loaded once per process."""
+    if model_name not in _TOKENIZERS:
+        _TOKENIZERS[model_name] = AutoTokenizer.from_pretrained(model_name)
+    return _TOKENIZERS[model_name]
+
+
+def load_model(model_name):
+    """(tokenizer, model) for model_name, loaded once per process."""
+    if model_name not in _MODELS:
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model.eval()
+        _MODELS[model_name] = model
+    return load_tokenizer(model_name), _MODELS[model_name]
+
+
+def clear_cache():
+    _TOKENIZERS.clear()
+    _MODELS.clear()
+
+
+def set_threads(threads):
+    """Set torch's intra-op CPU threads (and inter-op threads when still possible)."""
+    if not threads:
+        return
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(max(1, min(threads, 4)))
+    except RuntimeError:
+        pass                                # only allowed before the first parallel op
+
+
+# ──────────────────────────────────────────────────────────
+#  BATCHING
+# ──────────────────────────────────────────────────────────
+
+def token_lengths(tokenizer, texts, max_length=MAX_LENGTH):
+    """Token count of every text (with special tokens, after truncation)."""
+    encoded = tokenizer(list(texts), truncation=True, max_length=max_length)
+    return np.fromiter((len(ids) for ids in encoded["input_ids"]), dtype=np.int64,
+                       count=len(texts))
+
+
+def make_batches(lengths, max_tokens=MAX_TOKENS, max_batch=MAX_BATCH):
+    """
+    Group indices of texts sorted by length into batches whose padded size
+    (rows × longest row) is at most max_tokens.
+    Returns: list of index arrays
+    """
+    order = np.argsort(lengths, kind="stable")
+    batches = []
+    current = []
+    for i in order:
+        # Sorted ascending, so the newest row is the longest in the batch
+        if current and ((len(current) + 1) * lengths[i] > max_tokens
+                        or len(current) >= max_batch):
+            batches.append(np.array(current))
+            current = []
+        current.append(i)
+    if current:
+        batches.append(np.array(current))
+    return batches
+
+
+def predict_batch(tokenizer, model, texts, max_length=MAX_LENGTH):
+    """
+    Top label and score of every text in one forward pass. Scores follow the
+    text-classification pipeline: sigmoid for single-logit and multi-label
+    models, softmax otherwise.
+    """
+    enc = tokenizer(list(texts), padding=True, truncation=True, max_length=max_length,
+                    return_tensors="pt")
+    with torch.inference_mode():
+        logits = model(**enc).logits.float()
+    config = model.config
+    if config.num_labels == 1 or config.problem_type == "multi_label_classification":
+        probs = torch.sigmoid(logits)
+    else:
+        probs = torch.softmax(logits, dim=-1)
+    scores, ids = probs.max(dim=-1)
+    id2label = model.config.id2label
+    return [{"label": id2label[int(i)], "score": float(s)} for i, s in zip(ids, scores)]
+
+
+# ──────────────────────────────────────────────────────────
+#  WORKER PROCESSES
+# ──────────────────────────────────────────────────────────
+
+def _worker_init(model_name, threads):
+    set_threads(threads)
+    load_model(model_name)
+
+
+def _worker_run(model_name, batches, max_length):
+    """Run a list of (indices, texts) batches. Returns list of (indices, predictions)."""
+    tokenizer, model = load_model(model_name)
+    return [(idx, predict_batch(tokenizer, model, texts, max_length))
+            for idx, texts in batches]
+
+
+def _split_by_cost(batches, lengths, parts):
+    """Deal batches to `parts` workers, largest padded size first, to balance the work."""
+    cost = [len(b) * int(lengths[b].max()) for b in batches]
+    shares = [[] for _ in range(parts)]
+    load = [0] * parts
+    for k in sorted(range(len(batches)), key=lambda k: -cost[k]):
+        w = load.index(min(load))
+        shares[w].append(batches[k])
+        load[w] += cost[k]
+    return [s for s in shares if s]
+
+
+# ──────────────────────────────────────────────────────────
+#  RUNNER
+# ──────────────────────────────────────────────────────────
+
+class InferenceRunner:
+    """
+    Batched classifier for one model. Keep the runner (and its process pool,
+    if any) around to reuse loaded models across runs; close() releases the pool.
+    """
+
+    def __init__(self, model_name, threads=None, processes=1, max_tokens=MAX_TOKENS,
+                 max_batch=MAX_BATCH, max_length=MAX_LENGTH):
+        self.model_name = model_name
+        self.processes = max(1, processes)
+        self.max_tokens = max_tokens
+        self.max_batch = max_batch
+        self.max_length = max_length
+        self.last_stats = {}
+        cores = os.cpu_count() or 1
+        self.threads = threads or max(1, cores // self.processes)
+
+        self._pool = None
+        self.model = None
+        if self.processes > 1:
+            # Workers hold the model; this process only measures token lengths
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=mp.get_context("spawn"),
+                initializer=_worker_init, initargs=(model_name, self.threads))
+            self.tokenizer = load_tokenizer(model_name)
+        else:
+            set_threads(self.threads)
+            self.tokenizer, self.model = load_model(model_name)
+
+    def predict(self, texts):
+        """Classify texts. Returns pipeline-style dicts in the original order."""
+        texts = list(texts)
+        start = time.perf_counter()
+        lengths = token_lengths(self.tokenizer, texts, self.max_length)
+        batches = make_batches(lengths, self.max_tokens, self.max_batch)
+        preds = [None] * len(texts)
+
+        if self._pool is None:
+            for idx in batches:
+                out = predict_batch(self.tokenizer, self.model, [texts[i] for i in idx],
+                                    self.max_length)
+                for i, p in zip(idx, out):
+                    preds[i] = p
+        else:
+            shares = _split_by_cost(batches, lengths, self.processes)
+            futures = [self._pool.submit(_worker_run, self.model_name,
+                                         [(idx, [texts[i] for i in idx]) for idx in share],
+                                         self.max_length)
+                       for share in shares]
+            for future in futures:
+                for idx, out in future.result():
+                    for i, p in zip(idx, out):
+                        preds[i] = p
+
+        elapsed = time.perf_counter() - start
+        self.last_stats = {
+            "sentences": len(texts),
+            "batches": len(batches),
+            "seconds": elapsed,
+            "sentences_per_second": len(texts) / elapsed if elapsed else 0.0,
+            "padding_ratio": float(sum(len(b) * lengths[b].max() for b in batches)
+                                   / max(int(lengths.sum()), 1)),
+        }
+        return preds
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def to_binary(preds):
+    """Notebook label convention: exactly "POSITIVE" → 1, anything else → 0."""
+    return [1 if p["label"] == "POSITIVE" else 0 for p in preds]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Length-bucketed batched text classification")
+    parser.add_argument("--model", required=True, help="hub id or local model directory")
+    parser.add_argument("--texts", help="text file with one sentence per line "
+                                        "(default: SST-2 validation set)")
+    parser.add_argument("--num", type=int, default=None, help="use the first N texts")
+    parser.add_argument("--threads", type=int, default=None, help="torch threads per process")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--max-tokens", type=int, default=MAX_TOKENS)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--repeat", type=int, default=1, help="runs (later runs reuse the model)")
+    args = parser.parse_args()
+
+    labels = None
+    if args.texts:
+        with open(args.texts, encoding="utf-8") as f:
+            texts = [line.rstrip("\n") for line in f if line.strip()]
+    else:
+        from datasets import load_dataset
+        test_data = load_dataset("stanfordnlp/sst2")["validation"]
+        texts, labels = test_data["sentence"], test_data["label"]
+    if args.num:
+        texts = texts[:args.num]
+        labels = labels[:args.num] if labels is not None else None
+
+    with InferenceRunner(args.model, args.threads, args.processes, args.max_tokens,
+                         args.max_batch) as runner:
+        for run in range(args.repeat):
+            preds = runner.predict(texts)
+            stats = runner.last_stats
+            print(f"Run {run + 1}: {stats['sentences']} sentences in {stats['seconds']:.2f}s "
+                  f"({stats['sentences_per_second']:.1f} sentences/s, {stats['batches']} "
+                  f"batches, padding ×{stats['padding_ratio']:.2f})")
+
+    if labels is not None:
+        from sklearn.metrics import accuracy_score
+        print(f"Accuracy = {accuracy_score(labels, to_binary(preds)):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+Model benchmarking harness feeding TOPSIS model selection.
+
+The notebook's "Inference Time" criterion is a single time.time() reading of
+a cold run, so model loading and noise can flip the ranking. This harness
+measures each model in a fresh process (so peak memory is per model):
+
+  - load time, accuracy, F1 and average confidence (one full batched run)
+  - per-request latency at several batch sizes: warm-up requests first, then
+    repeated timed passes; p50 / p95 / p99 in milliseconds
+  - throughput (sentences/s) per batch size
+  - peak resident memory (MB)
+
+Results are stored in a CSV table keyed by model and benchmark settings, so
+models are only measured once; ranking with different criteria, weights and
+impacts reads the table without running inference again.
+
+Usage:
+  python model_benchmark.py bench --models distilbert/distilbert-base-uncased-finetuned-sst-2-english,ProsusAI/finbert --num 200
+  python model_benchmark.py rank --criteria "accuracy:1:+,f1:1:+,p95_ms_bs8:1:-,peak_rss_mb:0.5:-"
+  python model_benchmark.py rank --settings '{"batch_sizes": [1, 8, 32], "num": 200, ...}'
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:            # Windows
+    resource = None
+
+
+CACHE_FILE = "benchmark_results.csv"
+BATCH_SIZES = (1, 8, 32)
+PERCENTILES = (50, 95, 99)
+
+
+# ──────────────────────────────────────────────────────────
+#  TOPSIS (same method as the notebook)
+# ──────────────────────────────────────────────────────────
+
+def TOPSIS(matrix, weights, impacts):
+    matrix = np.asarray(matrix, dtype=float)
+    matrix = matrix / np.sqrt((matrix ** 2).sum(axis=0))
+    matrix = matrix * np.asarray(weights, dtype=float)
+    plus = np.array([impact == "+" for impact in impacts])
+
+    ideal_best = np.where(plus, matrix.max(axis=0), matrix.min(axis=0))
+    ideal_worst = np.where(plus, matrix.min(axis=0), matrix.max(axis=0))
+
+    d_best = np.sqrt(((matrix - ideal_best) ** 2).sum(axis=1))
+    d_worst = np.sqrt(((matrix - ideal_worst) ** 2).sum(axis=1))
+
+    scores = d_worst / (d_best + d_worst)
+    best_index = np.argmax(scores)
+
+    return best_index, scores
+
+
+# ──────────────────────────────────────────────────────────
+#  MEASUREMENT (runs in a fresh process per model)
+# ──────────────────────────────────────────────────────────
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unavailable, e.g. Windows)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def latency_profile(tokenizer, model, texts, batch_size, warmups, repeats):
+    """
+    Per-request latencies for requests of batch_size texts.
+    Returns: dict with p50/p95/p99 (ms) and throughput (sentences/s)
+    """
+    from inference_runner import predict_batch
+
+    requests = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    for k in range(warmups):
+        predict_batch(tokenizer, model, requests[k % len(requests)])
+
+    latencies = []
+    total_time = 0.0
+    for _ in range(repeats):
+        for request in requests:
+            start = time.perf_counter()
+            predict_batch(tokenizer, model, request)
+            elapsed = time.perf_counter() - start
+            latencies.append(elapsed)
+            total_time += elapsed
+
+    row = {f"p{q}_ms_bs{batch_size}": float(np.percentile(latencies, q)) * 1000
+           for q in PERCENTILES}
+    row[f"throughput_bs{batch_size}"] = repeats * len(texts) / total_time
+    return row
+
+
+def measure_model(model_name, texts, labels, batch_sizes=BATCH_SIZES, warmups=3, repeats=5,
+                  threads=None):
+    """Benchmark one model in the current process. Returns a flat dict of metrics."""
+    from sklearn.metrics import accuracy_score, f1_score
+    from inference_runner import InferenceRunner, load_model, set_threads, to_binary
+
+    set_threads(threads)
+    start = time.perf_counter()
+    tokenizer, model = load_model(model_name)
+    row = {"model": model_name, "load_seconds": time.perf_counter() - start}
+
+    # Quality metrics from one full, length-bucketed run
+    runner = InferenceRunner(model_name, threads=threads)
+    preds = runner.predict(texts)
+    if labels is not None:
+        y_pred = to_binary(preds)
+        row["accuracy"] = accuracy_score(labels, y_pred)
+        row["f1"] = f1_score(labels, y_pred)
+    row["avg_confidence"] = float(np.mean([p["score"] for p in preds]))
+    row["bucketed_throughput"] = runner.last_stats["sentences_per_second"]
+
+    for batch_size in batch_sizes:
+        row.update(latency_profile(tokenizer, model, texts, batch_size, warmups, repeats))
+    row["peak_rss_mb"] = peak_rss_mb()
+    return row
+
+
+def _measure_isolated(model_name, texts, labels, batch_sizes, warmups, repeats, threads):
+    """Run measure_model in a fresh spawned process so memory and caches start clean."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+        return pool.submit(measure_model, model_name, texts, labels, batch_sizes,
+                           warmups, repeats, threads).result()
+
+
+# ──────────────────────────────────────────────────────────
+#  RESULT CACHE
+# ──────────────────────────────────────────────────────────
+
+def settings_key(num_texts, batch_sizes, warmups, repeats, threads):
+    """String identifying the benchmark settings a row was measured with."""
+    return json.dumps({"num": num_texts, "batch_sizes": list(batch_sizes),
+                       "warmups": warmups, "repeats": repeats, "threads": threads},
+                      sort_keys=True)
+
+
+def load_table(path=CACHE_FILE):
+    if os.path.exists(path):
+        return pd.read_csv(path)
+    return pd.DataFrame(columns=["model", "settings"])
+
+
+def save_table(table, path=CACHE_FILE):
+    tmp = path + ".tmp"
+    table.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def benchmark(models, texts, labels=None, batch_sizes=BATCH_SIZES, warmups=3, repeats=5,
+              threads=None, cache_path=CACHE_FILE, force=False):
+    """
+    Benchmark every model not already in the cache with the same settings.
+    The table is saved after each model. Returns the full table.
+    """
+    table = load_table(cache_path)
+    key = settings_key(len(texts), batch_sizes, warmups, repeats, threads)
+    for model_name in models:
+        cached = (table["model"] == model_name) & (table["settings"] == key)
+        if cached.any() and not force:
+            print(f"Cached: {model_name}")
+            continue
+        print(f"\nBenchmarking: {model_name}")
+        row = _measure_isolated(model_name, list(texts), labels, tuple(batch_sizes),
+                                warmups, repeats, threads)
+        row["settings"] = key
+        table = pd.concat([table[~cached], pd.DataFrame([row])], ignore_index=True)
+        save_table(table, cache_path)
+        peak = f"{row['peak_rss_mb']:.0f} MB" if row["peak_rss_mb"] is not None else "n/a"
+        print(f"  load {row['load_seconds']:.2f}s, peak {peak}, "
+              + ", ".join(f"bs{b}: p95 {row[f'p95_ms_bs{b}']:.1f} ms" for b in batch_sizes))
+    return table
+
+
+# ──────────────────────────────────────────────────────────
+#  RANKING
+# ──────────────────────────────────────────────────────────
+
+def parse_criteria(spec):
+    """'col:weight:impact,...' → list of (column, weight, impact)."""
+    criteria = []
+    for item in spec.split(","):
+        parts = item.strip().split(":")
+        if len(parts) != 3 or parts[2] not in ("+", "-"):
+            raise ValueError(f"Criterion '{item}' must look like column:weight:+ or column:weight:-")
+        weight = float(parts[1])
+        if weight <= 0:
+            raise ValueError(f"Weight of '{parts[0]}' must be positive")
+        criteria.append((parts[0], weight, parts[2]))
+    return criteria
+
+
+def normalize_settings(settings):
+    """Settings key in the stored form (accepts any JSON spacing / key order)."""
+    try:
+        return json.dumps(json.loads(settings), sort_keys=True)
+    except ValueError:
+        raise ValueError(f"Settings must be a JSON object as shown by --list, got: {settings}")
+
+
+def rank(table, criteria, settings=None):
+    """
+    TOPSIS ranking of the cached rows measured with one settings key, so
+    every model is compared under the same batch sizes, text count and
+    threads. settings=None uses the most recently measured settings.
+    Returns: DataFrame with the criteria columns, TOPSIS Score and Rank
+    """
+    if table.empty:
+        raise ValueError("No benchmark rows")
+    if settings is None:
+        settings = table["settings"].iloc[-1]               # rows are appended in run order
+    else:
+        settings = normalize_settings(settings)
+        if not (table["settings"] == settings).any():
+            raise ValueError(f"No benchmark rows with settings {settings}")
+    table = table[table["settings"] == settings]
+    columns = [c for c, _, _ in criteria]
+    missing = [c for c in columns if c not in table.columns]
+    if missing:
+        raise ValueError(f"Unknown criteria: {', '.join(missing)}")
+    table = table.dropna(subset=columns)
+    if table.empty:
+        raise ValueError("No benchmark rows with all the chosen criteria")
+
+    _, scores = TOPSIS(table[columns].to_numpy(dtype=float),
+                       [w for _, w, _ in criteria], [i for _, _, i in criteria])
+    result = table[["model"] + columns].copy()
+    result["TOPSIS Score"] = scores
+    result["Rank"] = result["TOPSIS Score"].rank(ascending=False, method="min").astype(int)
+    return result.sort_values("Rank").reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark models and rank them with TOPSIS")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bench = sub.add_parser("bench", help="measure models (skips cached ones)")
+    bench.add_argument("--models", required=True, help="comma-separated hub ids or local dirs")
+    bench.add_argument("--num", type=int, default=200, help="SST-2 validation texts to use")
+    bench.add_argument("--batch-sizes", default=",".join(map(str, BATCH_SIZES)))
+    bench.add_argument("--warmups", type=int, default=3)
+    bench.add_argument("--repeats", type=int, default=5)
+    bench.add_argument("--threads", type=int, default=None)
+    bench.add_argument("--cache", default=CACHE_FILE)
+    bench.add_argument("--force", action="store_true", help="re-measure cached models")
+
+    rk = sub.add_parser("rank", help="rank cached results with TOPSIS")
+    rk.add_argument("--cache", default=CACHE_FILE)
+    rk.add_argument("--criteria", default="accuracy:1:+,f1:1:+,avg_confidence:1:+,p95_ms_bs8:1:-",
+                    help="comma-separated column:weight:impact")
+    rk.add_argument("--settings", default=None,
+                    help="settings key (JSON, see --list) of the run to rank; default: the latest")
+    rk.add_argument("--list", action="store_true",
+                    help="show the available criteria columns and settings keys")
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        from datasets import load_dataset
+        test_data = load_dataset("stanfordnlp/sst2")["validation"]
+        texts = test_data["sentence"][:args.num]
+        labels = test_data["label"][:args.num]
+        batch_sizes = tuple(int(b) for b in args.batch_sizes.split(","))
+        models = [m.strip() for m in args.models.split(",") if m.strip()]
+        benchmark(models, texts, labels, batch_sizes, args.warmups, args.repeats,
+                  args.threads, args.cache, args.force)
+        print(f"\nResults saved to {args.cache}")
+        return
+
+    table = load_table(args.cache)
+    if table.empty:
+        print(f"No results in {args.cache}. Run the bench command first.")
+        sys.exit(1)
+    if args.list:
+        print("Criteria columns:")
+        print("\n".join(f"  {c}" for c in table.columns if c not in ("model", "settings")))
+        print("\nSettings keys (models measured):")
+        for key, rows in table.groupby("settings", sort=False):
+            print(f"  {key}  ({len(rows)})")
+        return
+    try:
+        result = rank(table, parse_criteria(args.criteria), args.settings)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(result.round(4).to_string(index=False))
+    print("\nBest Model:", result.loc[0, "model"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Tests for the length-bucketed inference runner, using a tiny randomly
+initialised DistilBERT saved to a temporary directory (no download needed).
+
+Run from this directory:
+  python -m pytest test_inference_runner.py
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from inference_runner import InferenceRunner, make_batches, to_binary  # noqa: E402
+
+
+TEXTS = [
+    "good",
+    "a truly wonderful film with a great cast and a story that never lets go",
+    "bad movie",
+    "the plot is thin",
+    "i would not watch this again even if it were free and the popcorn too",
+    "great",
+    "a slow start but a great ending",
+    "not good not bad just a film",
+    "wonderful",
+    "the cast is great but the story is bad and the ending is thin",
+]
+
+
+def _save_tiny_model(directory, num_labels):
+    words = sorted({w for t in TEXTS for w in t.split()})
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words
+    vocab_file = directory / "vocab.txt"
+    vocab_file.write_text("\n".join(vocab) + "\n", encoding="utf-8")
+
+    labels = ["NEGATIVE", "POSITIVE"] if num_labels == 2 else ["LABEL_0"]
+    config = transformers.DistilBertConfig(
+        vocab_size=len(vocab), dim=32, n_layers=2, n_heads=2, hidden_dim=64,
+        max_position_embeddings=64, num_labels=num_labels,
+        id2label=dict(enumerate(labels)), label2id={l: i for i, l in enumerate(labels)})
+    torch.manual_seed(0)
+    transformers.DistilBertForSequenceClassification(config).save_pretrained(directory)
+    transformers.DistilBertTokenizerFast(str(vocab_file)).save_pretrained(directory)
+    return str(directory)
+
+
+@pytest.fixture(scope="module", params=[2, 1], ids=["two-labels", "single-logit"])
+def tiny_model(request, tmp_path_factory):
+    return _save_tiny_model(tmp_path_factory.mktemp(f"tiny{request.param}"), request.param)
+
+
+def test_matches_pipeline_in_input_order(tiny_model):
+    clf = transformers.pipeline("text-classification", model=tiny_model, device="cpu")
+    expected = [clf(t)[0] for t in TEXTS]
+
+    # A small token budget forces several length buckets
+    with InferenceRunner(tiny_model, threads=1, max_tokens=40) as runner:
+        preds = runner.predict(TEXTS)
+        assert runner.last_stats["batches"] > 1
+
+    assert [p["label"] for p in preds] == [e["label"] for e in expected]
+    for p, e in zip(preds, expected):
+        assert p["score"] == pytest.approx(e["score"], abs=1e-4)
+
+
+def test_single_logit_scores_are_not_constant(tiny_model):
+    with InferenceRunner(tiny_model, threads=1) as runner:
+        scores = [p["score"] for p in runner.predict(TEXTS)]
+    assert all(0.0 < s < 1.0 for s in scores)
+    assert len(set(round(s, 6) for s in scores)) > 1
+
+
+def test_worker_processes_keep_order(tiny_model):
+    with InferenceRunner(tiny_model, threads=1, max_tokens=40) as runner:
+        single = runner.predict(TEXTS)
+    with InferenceRunner(tiny_model, threads=1, processes=2, max_tokens=40) as runner:
+        parallel = runner.predict(TEXTS)
+    assert [p["label"] for p in parallel] == [p["label"] for p in single]
+    for p, s in zip(parallel, single):
+        assert p["score"] == pytest.approx(s["score"], abs=1e-5)
+
+
+def test_make_batches_respects_budget():
+    lengths = [3, 40, 5, 12, 7, 30, 4]
+    batches = make_batches(lengths, max_tokens=40, max_batch=4)
+    assert sorted(i for b in batches for i in b) == list(range(len(lengths)))
+    for b in batches:
+        assert len(b) <= 4
+        assert len(b) == 1 or len(b) * max(lengths[i] for i in b) <= 40
+
+
+def test_to_binary_is_exact():
+    preds = [{"label": "POSITIVE"}, {"label": "positive"}, {"label": "NEGATIVE"}]
+    assert to_binary(preds) == [1, 0, 0]
@@ -0,0 +1,226 @@
+"""
+Vectorized M/M/1 queue simulator for the Simulation notebook.
+
+run_simulation() in the notebook builds a simpy.Environment with one
+generator process per customer, so generating the dataset is dominated by
+the event loop. For a single FIFO server the waiting times follow the
+Lindley recursion
+
+    W_1 = 0,   W_{i+1} = max(0, W_i + S_i - T_{i+1})
+
+(S = service times, T = inter-arrival times), which has the closed form
+
+    C = [0, cumsum(S_i - T_{i+1})],   W = C - minimum.accumulate(C)
+
+so a whole run is a few NumPy array operations, and many parameter sets are
+simulated at once as rows of one padded 2-D array. As in the SimPy model, a
+customer's wait is recorded only if their service starts before sim_time.
+
+Usage:
+  python queue_sim.py --num 1000 --output simulation_data.csv
+  python queue_sim.py --validate         # compare with the SimPy model
+"""
+
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+
+COLUMNS = ["arrival_rate", "service_rate", "simulation_time", "avg_wait_time"]
+BATCH_SIZE = 1000               # parameter sets simulated together
+
+
+# ──────────────────────────────────────────────────────────
+#  PARAMETERS
+# ──────────────────────────────────────────────────────────
+
+def generate_parameters(n, rng):
+    """
+    n random parameter sets, drawn like generate_random_parameters() in the notebook.
+    Returns: (arrival_rates, service_rates, sim_times)
+    """
+    arrival_rates = rng.uniform(0.5, 5, n)
+    service_rates = rng.uniform(0.5, 6, n)
+    sim_times = rng.integers(50, 201, n)
+    return arrival_rates, service_rates, sim_times
+
+
+# ──────────────────────────────────────────────────────────
+#  SIMULATION
+# ──────────────────────────────────────────────────────────
+
+def _customers_needed(arrival_rates, sim_times):
+    """Customers to generate so that arrivals almost surely pass sim_time."""
+    mean = float(np.max(arrival_rates * sim_times))
+    return int(np.ceil(mean + 6 * np.sqrt(mean) + 10))
+
+
+def simulate_batch(arrival_rates, service_rates, sim_times, rng):
+    """
+    Mean waiting time for every parameter set (one row each).
+    Rows are padded to the same number of customers and masked.
+    Returns: np.ndarray of mean waits (0 where no customer was served)
+    """
+    arrival_rates = np.asarray(arrival_rates, dtype=float)
+    service_rates = np.asarray(service_rates, dtype=float)
+    sim_times = np.asarray(sim_times, dtype=float)
+    result = np.zeros(len(arrival_rates))
+
+    todo = np.arange(len(arrival_rates))
+    n = _customers_needed(arrival_rates, sim_times)
+    while todo.size:
+        lam = arrival_rates[todo, None]
+        mu = service_rates[todo, None]
+        horizon = sim_times[todo, None]
+
+        inter = rng.standard_exponential((todo.size, n)) / lam
+        service = rng.standard_exponential((todo.size, n)) / mu
+        arrivals = np.cumsum(inter, axis=1)
+
+        # Random walk C_i = sum_{k<i} (S_k - T_{k+1}), starting at 0
+        walk = np.zeros((todo.size, n))
+        np.cumsum(service[:, :-1] - inter[:, 1:], axis=1, out=walk[:, 1:])
+        waits = walk - np.minimum.accumulate(walk, axis=1)
+
+        served = arrivals + waits < horizon           # service starts before sim_time
+        count = served.sum(axis=1)
+        total = np.where(served, waits, 0.0).sum(axis=1)
+
+        # Rows whose last generated arrival is before sim_time ran out of customers
+        short = arrivals[:, -1] < horizon[:, 0]
+        done = todo[~short]
+        result[done] = np.divide(total[~short], count[~short],
+                                 out=np.zeros(done.size), where=count[~short] > 0)
+        todo = todo[short]
+        n *= 2
+    return result
+
+
+def simulate(arrival_rates, service_rates, sim_times, seed=None, batch_size=BATCH_SIZE):
+    """
+    Mean waiting time for every parameter set, simulated batch_size sets at a time.
+    seed may be an int, None or an existing np.random.Generator.
+    """
+    rng = np.random.default_rng(seed)
+    arrival_rates = np.asarray(arrival_rates, dtype=float)
+    service_rates = np.asarray(service_rates, dtype=float)
+    sim_times = np.asarray(sim_times, dtype=float)
+
+    out = np.empty(len(arrival_rates))
+    for start in range(0, len(out), batch_size):
+        sl = slice(start, start + batch_size)
+        out[sl] = simulate_batch(arrival_rates[sl], service_rates[sl], sim_times[sl], rng)
+    return out
+
+
+def generate_dataset(num_simulations=1000, seed=None, batch_size=BATCH_SIZE):
+    """The notebook's simulation dataset, generated with the vectorized engine."""
+    rng = np.random.default_rng(seed)
+    arrival_rates, service_rates, sim_times = generate_parameters(num_simulations, rng)
+    waits = simulate(arrival_rates, service_rates, sim_times, rng, batch_size)
+    return pd.DataFrame({
+        "arrival_rate": arrival_rates,
+        "service_rate": service_rates,
+        "simulation_time": sim_times,
+        "avg_wait_time": waits,
+    }, columns=COLUMNS)
+
+
+# ──────────────────────────────────────────────────────────
+#  VALIDATION AGAINST SIMPY
+# ──────────────────────────────────────────────────────────
+
+def run_simulation_simpy(arrival_rate, service_rate, sim_time):
+    """The notebook's SimPy model (reference implementation)."""
+    import simpy     # pip install simpy
+
+    env = simpy.Environment()
+    server = simpy.Resource(env, capacity=1)
+    wait_times = []
+
+    def customer():
+        arrival_time = env.now
+        with server.request() as request:
+            yield request
+            wait_times.append(env.now - arrival_time)
+            yield env.timeout(np.random.exponential(1 / service_rate))
+
+    def arrivals():
+        while True:
+            yield env.timeout(np.random.exponential(1 / arrival_rate))
+            env.process(customer())
+
+    env.process(arrivals())
+    env.run(until=sim_time)
+    return np.mean(wait_times) if wait_times else 0
+
+
+# Light, medium, heavy and overloaded traffic
+VALIDATION_CASES = [(0.5, 2.0, 100), (2.0, 3.0, 100), (4.5, 5.0, 200), (3.0, 2.0, 50)]
+
+
+def validate_against_simpy(cases=VALIDATION_CASES, replications=300, seed=0, z=4.0):
+    """
+    Run both engines `replications` times per parameter set and check that the
+    mean of avg_wait_time agrees within z combined standard errors.
+    Returns: (passed, rows) where rows are dicts per case
+    """
+    np.random.seed(seed)                       # SimPy model uses the global RNG
+    rng = np.random.default_rng(seed)
+    rows = []
+    passed = True
+    for lam, mu, horizon in cases:
+        start = time.perf_counter()
+        ref = np.array([run_simulation_simpy(lam, mu, horizon) for _ in range(replications)])
+        t_ref = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fast = simulate_batch(np.full(replications, lam), np.full(replications, mu),
+                              np.full(replications, horizon), rng)
+        t_fast = time.perf_counter() - start
+
+        se = np.sqrt(ref.var(ddof=1) / replications + fast.var(ddof=1) / replications)
+        diff = abs(ref.mean() - fast.mean())
+        ok = bool(diff <= z * se)
+        passed &= ok
+        rows.append({"arrival_rate": lam, "service_rate": mu, "simulation_time": horizon,
+                     "simpy_mean": ref.mean(), "vectorized_mean": fast.mean(),
+                     "z_score": diff / se if se else 0.0, "ok": ok,
+                     "speedup": t_ref / t_fast if t_fast else float("inf")})
+    return passed, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized M/M/1 queue simulator")
+    parser.add_argument("--num", type=int, default=1000, help="number of simulations")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE)
+    parser.add_argument("--output", help="save the dataset as CSV")
+    parser.add_argument("--validate", action="store_true",
+                        help="compare with the SimPy model instead of generating data")
+    parser.add_argument("--replications", type=int, default=300)
+    args = parser.parse_args()
+
+    if args.validate:
+        passed, rows = validate_against_simpy(replications=args.replications,
+                                              seed=args.seed or 0)
+        print(pd.DataFrame(rows).round(4).to_string(index=False))
+        print("\nValidation", "passed" if passed else "FAILED")
+        if not passed:
+            sys.exit(1)
+        return
+
+    start = time.perf_counter()
+    df = generate_dataset(args.num, args.seed, args.batch)
+    elapsed = time.perf_counter() - start
+    print("Simulation Data\n", df)
+    print(f"\n{args.num} simulations in {elapsed:.3f}s")
+    if args.output:
+        df.to_csv(args.output, index=False)
+        print(f"Dataset saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
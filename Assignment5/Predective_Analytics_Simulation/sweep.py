@@ -0,0 +1,176 @@
+"""
+Process-parallel, reproducible parameter sweeps for the simulation dataset.
+
+The notebook draws parameters from the global `random` / `np.random` state
+and runs the simulations one after another, so splitting the work over
+processes would change the results. This runner:
+
+  - cuts the sweep into fixed chunks of rows; chunk k always gets the RNG
+    stream SeedSequence(root_seed, spawn_key=(k,)), so every row is identical
+    for any worker count and any completion order
+  - runs the chunks on a process pool (vectorized engine from queue_sim.py,
+    or the notebook's SimPy model with --engine simpy)
+  - writes every finished chunk as its own Parquet part file via a temporary
+    file and an atomic rename; on restart, chunks whose part exists are
+    skipped, so an interrupted sweep resumes where it stopped
+
+Usage:
+  python sweep.py --num 1000000 --seed 42 --out sweep_data --workers 16
+  python sweep.py --out sweep_data --collect simulation_data.parquet
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+import pandas as pd
+
+from queue_sim import COLUMNS, generate_parameters, simulate, run_simulation_simpy
+
+
+CHUNK_SIZE = 10_000
+META_FILE = "_sweep.json"
+ENGINES = ("vectorized", "simpy")
+
+
+def chunk_rng(root_seed, chunk):
+    """Independent, reproducible generator for one chunk."""
+    return np.random.default_rng(np.random.SeedSequence(root_seed, spawn_key=(chunk,)))
+
+
+def part_path(out_dir, chunk):
+    return os.path.join(out_dir, f"part-{chunk:06d}.parquet")
+
+
+def run_chunk(out_dir, root_seed, chunk, chunk_size, num_runs, engine="vectorized"):
+    """
+    Simulate runs [chunk·chunk_size, min((chunk+1)·chunk_size, num_runs)) and
+    write them as a Parquet part (atomically).
+    Returns: (chunk, rows, seconds)
+    """
+    start = time.perf_counter()
+    first = chunk * chunk_size
+    rows = min(chunk_size, num_runs - first)
+    rng = chunk_rng(root_seed, chunk)
+    arrival_rates, service_rates, sim_times = generate_parameters(rows, rng)
+    if engine == "simpy":
+        # The SimPy model draws from the global RNG: seed it from this chunk's stream
+        np.random.seed(rng.integers(2**32))
+        waits = np.array([run_simulation_simpy(a, s, t)
+                          for a, s, t in zip(arrival_rates, service_rates, sim_times)])
+    else:
+        waits = simulate(arrival_rates, service_rates, sim_times, rng)
+
+    df = pd.DataFrame({
+        "arrival_rate": arrival_rates,
+        "service_rate": service_rates,
+        "simulation_time": sim_times,
+        "avg_wait_time": waits,
+    }, columns=COLUMNS)
+    df.insert(0, "run_id", np.arange(first, first + len(df), dtype=np.int64))
+
+    path = part_path(out_dir, chunk)
+    tmp = path + ".tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return chunk, len(df), time.perf_counter() - start
+
+
+def _check_meta(out_dir, meta):
+    """Write the sweep settings, or refuse to resume a sweep made with other settings."""
+    path = os.path.join(out_dir, META_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            existing = json.load(f)
+        if existing != meta:
+            raise ValueError(f"{out_dir} holds a sweep with different settings: {existing}")
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+def run_sweep(num_runs, out_dir, root_seed=42, workers=None, chunk_size=CHUNK_SIZE,
+              engine="vectorized", verbose=True):
+    """
+    Run (or resume) a sweep of num_runs simulations into out_dir.
+    Returns: number of chunks computed in this call
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}' (use one of: {', '.join(ENGINES)})")
+    os.makedirs(out_dir, exist_ok=True)
+    num_chunks = -(-num_runs // chunk_size)
+    _check_meta(out_dir, {"num_runs": num_runs, "root_seed": root_seed,
+                          "chunk_size": chunk_size, "engine": engine})
+
+    for tmp in glob.glob(os.path.join(out_dir, "*.tmp")):
+        os.remove(tmp)                               # leftovers of an interrupted write
+    todo = [k for k in range(num_chunks) if not os.path.exists(part_path(out_dir, k))]
+    if verbose and len(todo) < num_chunks:
+        print(f"Resuming: {num_chunks - len(todo)} of {num_chunks} chunks already done")
+
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    done_rows = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        for k in todo:
+            if len(in_flight) >= workers * 2:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done_rows += future.result()[1]
+            in_flight.add(pool.submit(run_chunk, out_dir, root_seed, k, chunk_size, num_runs,
+                                      engine))
+            if verbose and done_rows:
+                elapsed = time.perf_counter() - start
+                print(f"\r  {done_rows} runs ({done_rows / elapsed:.0f} runs/s)",
+                      end="", flush=True)
+        for future in wait(in_flight).done:
+            done_rows += future.result()[1]
+    if verbose:
+        elapsed = time.perf_counter() - start
+        print(f"\n{done_rows} runs in {len(todo)} chunks, {elapsed:.1f}s")
+    return len(todo)
+
+
+def collect(out_dir):
+    """All finished parts of a sweep as one DataFrame, in run order."""
+    parts = sorted(glob.glob(os.path.join(out_dir, "part-*.parquet")))
+    if not parts:
+        return pd.DataFrame(columns=["run_id"] + COLUMNS)
+    return pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproducible process-parallel simulation sweep")
+    parser.add_argument("--num", type=int, default=1000, help="number of simulations")
+    parser.add_argument("--seed", type=int, default=42, help="root seed")
+    parser.add_argument("--out", default="sweep_data", help="directory of Parquet parts")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per core")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--engine", choices=ENGINES, default="vectorized")
+    parser.add_argument("--collect", metavar="FILE",
+                        help="merge the parts of --out into one Parquet/CSV file and exit")
+    args = parser.parse_args()
+
+    if args.collect:
+        df = collect(args.out)
+        if args.collect.endswith(".csv"):
+            df.to_csv(args.collect, index=False)
+        else:
+            df.to_parquet(args.collect, index=False)
+        print(f"{len(df)} runs written to {args.collect}")
+        return
+
+    try:
+        run_sweep(args.num, args.out, args.seed, args.workers, args.chunk_size, args.engine)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Tests for the vectorized M/M/1 simulator.
+
+Run from this directory:
+  python -m pytest test_queue_sim.py
+"""
+
+import numpy as np
+import pytest
+
+from queue_sim import simulate, simulate_batch, validate_against_simpy
+
+
+def test_matches_simpy_model():
+    pytest.importorskip("simpy")
+    passed, rows = validate_against_simpy(replications=60, seed=1)
+    assert passed, rows
+
+
+@pytest.mark.parametrize("lam, mu", [(1.0, 2.0), (2.0, 2.5)])
+def test_mean_wait_matches_mm1_formula(lam, mu):
+    # Long runs approach the stationary M/M/1 mean wait in queue, Wq = rho / (mu - lam)
+    rho = lam / mu
+    expected = rho / (mu - lam)
+    waits = simulate(np.full(8, lam), np.full(8, mu), np.full(8, 20000.0), seed=7)
+    assert waits.mean() == pytest.approx(expected, rel=0.05)
+
+
+def test_lindley_closed_form_matches_recursion():
+    # Replay the draws of simulate_batch and apply the recursion customer by customer
+    lam, mu, horizon = 1.5, 2.0, 30.0
+    waits = simulate_batch([lam], [mu], [horizon], np.random.default_rng(3))
+
+    rng = np.random.default_rng(3)
+    n = int(np.ceil(lam * horizon + 6 * np.sqrt(lam * horizon) + 10))
+    inter = rng.standard_exponential((1, n))[0] / lam
+    service = rng.standard_exponential((1, n))[0] / mu
+    arrivals = np.cumsum(inter)
+    assert arrivals[-1] >= horizon          # the first draw already covers sim_time
+
+    w, served = 0.0, []
+    for i in range(n):
+        if i:
+            w = max(0.0, w + service[i - 1] - inter[i])
+        if arrivals[i] + w < horizon:
+            served.append(w)
+    assert waits[0] == pytest.approx(np.mean(served))
+
+
+def test_empty_when_nobody_is_served():
+    # Arrivals far slower than the horizon: no customer, mean wait reported as 0
+    waits = simulate([1e-6], [1.0], [1.0], seed=0)
+    assert waits[0] == 0.0
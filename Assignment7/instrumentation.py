@@ -0,0 +1,179 @@
+"""
+Timing and progress instrumentation for the mashup pipeline.
+
+Every stage (fetch, download, decode, encode, cut, merge) is recorded as an event
+with start/end times, the thread it ran on, and extra fields such as bytes
+processed. From the events the tracer builds a JSON summary (time, bytes and
+throughput per stage) and a Chrome trace file (open in chrome://tracing or
+https://ui.perfetto.dev) that shows how stages overlap across threads.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+
+class PipelineTracer:
+    """Collects per-stage, per-item timing events. Safe to share between threads."""
+
+    def __init__(self, live=False, enabled=True, parent=None):
+        self.live = live
+        self.enabled = enabled
+        self.parent = parent
+        self.events = []
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self._started = time.time()
+
+    # ── recording ───────────────────────────────────────────
+
+    def record(self, stage, item, start, end, **fields):
+        """Add a finished event. start/end are time.perf_counter() values."""
+        if not self.enabled:
+            return
+        event = {
+            "stage": stage,
+            "item": item,
+            "start": start - self._t0,
+            "seconds": end - start,
+            "thread": threading.current_thread().name,
+            "tid": threading.get_ident(),
+        }
+        event.update(fields)
+        with self._lock:
+            self.events.append(event)
+        if self.parent is not None:
+            self.parent.record(stage, item, start, end, **fields)
+
+    def child(self):
+        """
+        Tracer for one job of a batch: its summary holds only that job's
+        events, and every event is also recorded in this (batch) tracer.
+        """
+        return PipelineTracer(live=self.live, enabled=self.enabled, parent=self)
+
+    @contextmanager
+    def span(self, stage, item=None, **fields):
+        """
+        Time a block of code. The yielded dict can be filled with extra fields
+        (e.g. bytes) while the block runs:
+
+            with tracer.span("encode", video_id) as ev:
+                audio.export(path)
+                ev["bytes"] = os.path.getsize(path)
+        """
+        extra = dict(fields)
+        start = time.perf_counter()
+        try:
+            yield extra
+        finally:
+            self.record(stage, item, start, time.perf_counter(), **extra)
+
+    def progress(self, stage, done, total):
+        """Update the live progress line (only when live display is on)."""
+        if not (self.enabled and self.live):
+            return
+        width = 30
+        filled = int(width * done / total) if total else width
+        bar = "#" * filled + "-" * (width - filled)
+        sys.stderr.write(f"\r  {stage:<10} [{bar}] {done}/{total}")
+        if done >= total:
+            sys.stderr.write("\n")
+        sys.stderr.flush()
+
+    def download_hook(self, job=None):
+        """yt-dlp progress hook that records one download event per file."""
+        def hook(d):
+            if d.get("status") == "downloading":
+                total = d.get("total_bytes") or d.get("total_bytes_estimate")
+                if total:
+                    self.progress("download", int(100 * d.get("downloaded_bytes", 0) / total), 100)
+            elif d.get("status") == "finished":
+                end = time.perf_counter()
+                elapsed = d.get("elapsed") or 0.0
+                size = d.get("total_bytes") or d.get("downloaded_bytes") or 0
+                info = d.get("info_dict") or {}
+                item = info.get("id") or os.path.basename(d.get("filename", ""))
+                self.record("download", item, end - elapsed, end, job=job, bytes=size,
+                            bytes_per_second=size / elapsed if elapsed else None)
+        return hook
+
+    # ── reporting ───────────────────────────────────────────
+
+    def summary(self):
+        """Aggregate events per stage: count, busy seconds, wall seconds, bytes, throughput."""
+        with self._lock:
+            events = list(self.events)
+
+        stages = {}
+        for ev in events:
+            s = stages.setdefault(ev["stage"], {
+                "count": 0, "busy_seconds": 0.0, "bytes": 0,
+                "first_start": ev["start"], "last_end": ev["start"] + ev["seconds"],
+            })
+            s["count"] += 1
+            s["busy_seconds"] += ev["seconds"]
+            s["bytes"] += ev.get("bytes") or 0
+            s["first_start"] = min(s["first_start"], ev["start"])
+            s["last_end"] = max(s["last_end"], ev["start"] + ev["seconds"])
+
+        for s in stages.values():
+            s["wall_seconds"] = s.pop("last_end") - s.pop("first_start")
+            s["mean_seconds"] = s["busy_seconds"] / s["count"]
+            s["bytes_per_second"] = (s["bytes"] / s["busy_seconds"]
+                                     if s["bytes"] and s["busy_seconds"] else None)
+
+        return {
+            "started": self._started,
+            "total_seconds": time.perf_counter() - self._t0,
+            "stages": stages,
+            "events": events,
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        print("\nPipeline timing:")
+        print(f"  {'Stage':<10} {'Items':>6} {'Busy (s)':>10} {'Wall (s)':>10} {'MB':>9} {'MB/s':>8}")
+        for stage, s in summary["stages"].items():
+            rate = f"{s['bytes_per_second'] / 1e6:8.2f}" if s["bytes_per_second"] else f"{'-':>8}"
+            print(f"  {stage:<10} {s['count']:>6} {s['busy_seconds']:>10.2f} "
+                  f"{s['wall_seconds']:>10.2f} {s['bytes'] / 1e6:>9.2f} {rate}")
+        print(f"  Total: {summary['total_seconds']:.2f} s")
+
+    def write_summary(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def write_trace(self, path):
+        """Write events in Chrome trace-event format (one row per thread)."""
+        with self._lock:
+            events = list(self.events)
+        pid = os.getpid()
+        trace = []
+        threads = {}
+        for ev in events:
+            threads.setdefault(ev["tid"], ev["thread"])
+            args = {k: v for k, v in ev.items()
+                    if k not in ("stage", "start", "seconds", "thread", "tid")}
+            trace.append({
+                "name": f"{ev['stage']} {ev['item']}" if ev["item"] else ev["stage"],
+                "cat": ev["stage"],
+                "ph": "X",
+                "ts": ev["start"] * 1e6,
+                "dur": ev["seconds"] * 1e6,
+                "pid": pid,
+                "tid": ev["tid"],
+                "args": args,
+            })
+        for tid, name in threads.items():
+            trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                          "args": {"name": name}})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+
+# Shared do-nothing tracer used when instrumentation is not requested
+NULL_TRACER = PipelineTracer(enabled=False)
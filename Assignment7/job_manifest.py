@@ -0,0 +1,98 @@
+"""
+Job manifest for resumable mashup runs.
+
+The manifest is a small JSON file in the work directory that records, for
+every video, which pipeline stages (download, convert, cut) have finished
+and where their output lives. A run started with --resume reads it back and
+skips everything that is already done.
+"""
+
+import os
+import json
+import tempfile
+
+
+MANIFEST_FILE = "mashup_job.json"
+
+# Pipeline stages tracked per video, in pipeline order
+STAGES = ("downloaded", "converted", "cut")
+
+
+class JobManifest:
+    """Progress of one mashup job, saved to disk after every completed item."""
+
+    def __init__(self, path, config, state=None, resumed=False):
+        self.path = path
+        self.config = config
+        self.resumed = resumed
+        self.state = state or {"config": config, "videos": None,
+                               "items": {stage: {} for stage in STAGES}}
+
+    @classmethod
+    def open(cls, config, resume=False, work_dir="."):
+        """
+        Return the manifest for this job. With resume=True a manifest left by
+        an earlier run with the same configuration is picked up; otherwise
+        (or if the configuration changed) a fresh one is started.
+        """
+        path = os.path.join(work_dir, MANIFEST_FILE)
+        if resume and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    state = json.load(f)
+                if state.get("config") == config:
+                    return cls(path, config, state, resumed=True)
+                print("Warning: Saved job was created with different parameters; starting over.")
+            except (OSError, ValueError):
+                print("Warning: Could not read saved job state; starting over.")
+        elif resume:
+            print("No saved job found; starting a new one.")
+
+        manifest = cls(path, config)
+        manifest.save()
+        return manifest
+
+    def save(self):
+        """Write the manifest atomically so a crash never leaves it half-written."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    # ── downloads ───────────────────────────────────────────
+
+    def videos(self):
+        """Downloaded video paths from an earlier run, or None if the download
+        stage has not finished (or any of its files has disappeared)."""
+        videos = self.state.get("videos")
+        if not videos or not all(os.path.exists(p) for p in videos):
+            return None
+        return videos
+
+    def set_videos(self, video_files):
+        self.state["videos"] = list(video_files)
+        for path in video_files:
+            self.state["items"]["downloaded"][os.path.basename(path)] = path
+        self.save()
+
+    # ── per-item stages ─────────────────────────────────────
+
+    def done(self, stage, item):
+        """Output path of a finished stage for item, or None if still to do."""
+        path = self.state["items"][stage].get(item)
+        if path and os.path.exists(path):
+            return path
+        return None
+
+    def mark(self, stage, item, path):
+        self.state["items"][stage][item] = path
+        self.save()
+
+    def progress(self):
+        """Number of items finished per stage, e.g. {'converted': 37, ...}."""
+        return {stage: len(items) for stage, items in self.state["items"].items()}
@@ -0,0 +1,189 @@
+"""
+Loudness analysis and normalization for mashup clips.
+
+Works on the raw PCM of a pydub AudioSegment as a NumPy array, with no
+per-sample or per-segment Python loops:
+  - integrated loudness in LUFS following ITU-R BS.1770 (K-weighting applied
+    in the frequency domain, 400 ms gated blocks from a cumulative sum)
+  - RMS level in dBFS
+  - leading silence detection over 10 ms frames
+"""
+
+import numpy as np
+
+
+TARGET_LUFS = -14.0            # common streaming loudness target
+SILENCE_THRESHOLD_DB = -50.0   # frames quieter than this count as silence
+PEAK_CEILING_DB = -1.0         # never push peaks above this after gain
+MAX_LEADING_SILENCE_MS = 30000 # only this much of the intro is searched for silence
+
+BLOCK_SECONDS = 0.4            # BS.1770 gating block
+BLOCK_STEP_SECONDS = 0.1       # 75 % overlap
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+
+
+# ──────────────────────────────────────────────────────────
+#  PCM <-> NumPy
+# ──────────────────────────────────────────────────────────
+
+def segment_to_array(segment):
+    """
+    Return the samples of an AudioSegment as float32 in [-1, 1],
+    shape (n_frames, channels), plus the (possibly re-encoded) segment.
+    """
+    if segment.sample_width not in (1, 2, 4):
+        segment = segment.set_sample_width(2)
+    width = segment.sample_width
+    if width == 1:                       # 8-bit PCM is unsigned
+        data = np.frombuffer(segment.raw_data, dtype=np.uint8).astype(np.float32)
+        data = (data - 128.0) / 128.0
+    else:
+        dtype = np.int16 if width == 2 else np.int32
+        data = np.frombuffer(segment.raw_data, dtype=dtype).astype(np.float32)
+        data /= float(2 ** (8 * width - 1))
+    return data.reshape(-1, segment.channels), segment
+
+
+def array_to_segment(samples, template):
+    """Build an AudioSegment from float samples using template's format."""
+    width = template.sample_width
+    scale = float(2 ** (8 * width - 1))
+    clipped = np.clip(samples, -1.0, (scale - 1) / scale)
+    if width == 1:
+        pcm = (clipped * 128.0 + 128.0).astype(np.uint8)
+    else:
+        pcm = (clipped * scale).astype(np.int16 if width == 2 else np.int32)
+    return template._spawn(pcm.tobytes())
+
+
+# ──────────────────────────────────────────────────────────
+#  ANALYSIS
+# ──────────────────────────────────────────────────────────
+
+def rms_dbfs(samples):
+    """RMS level over all channels in dBFS (-inf for digital silence)."""
+    if samples.size == 0:
+        return float("-inf")
+    rms = np.sqrt(np.mean(np.square(samples, dtype=np.float64)))
+    return float(20 * np.log10(rms)) if rms > 0 else float("-inf")
+
+
+def _biquad_response(b, a, w):
+    """Complex frequency response of a biquad at angular frequencies w."""
+    z1 = np.exp(-1j * w)
+    z2 = z1 * z1
+    return (b[0] + b[1] * z1 + b[2] * z2) / (a[0] + a[1] * z1 + a[2] * z2)
+
+
+def k_weighting(n_fft, rate):
+    """
+    BS.1770 K-weighting (high-shelf pre-filter + RLB high-pass) evaluated on
+    the rfft bins of an n_fft-point transform at the given sample rate.
+    """
+    w = 2 * np.pi * np.fft.rfftfreq(n_fft, d=1.0 / rate) / rate
+
+    # Stage 1: high shelf, +4 dB above ~1.5 kHz
+    gain_db, q, fc = 4.0, 1 / np.sqrt(2), 1500.0
+    A = 10 ** (gain_db / 40)
+    w0 = 2 * np.pi * fc / rate
+    alpha = np.sin(w0) / (2 * q)
+    cos_w0 = np.cos(w0)
+    shelf_b = (A * ((A + 1) + (A - 1) * cos_w0 + 2 * np.sqrt(A) * alpha),
+               -2 * A * ((A - 1) + (A + 1) * cos_w0),
+               A * ((A + 1) + (A - 1) * cos_w0 - 2 * np.sqrt(A) * alpha))
+    shelf_a = ((A + 1) - (A - 1) * cos_w0 + 2 * np.sqrt(A) * alpha,
+               2 * ((A - 1) - (A + 1) * cos_w0),
+               (A + 1) - (A - 1) * cos_w0 - 2 * np.sqrt(A) * alpha)
+
+    # Stage 2: high pass at ~38 Hz
+    q, fc = 0.5, 38.0
+    w0 = 2 * np.pi * fc / rate
+    alpha = np.sin(w0) / (2 * q)
+    cos_w0 = np.cos(w0)
+    hp_b = ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2)
+    hp_a = (1 + alpha, -2 * cos_w0, 1 - alpha)
+
+    return _biquad_response(shelf_b, shelf_a, w) * _biquad_response(hp_b, hp_a, w)
+
+
+def integrated_loudness(samples, rate):
+    """Gated integrated loudness of samples (n_frames, channels) in LUFS."""
+    n = samples.shape[0]
+    if n == 0:
+        return float("-inf")
+
+    # K-weighting on all channels at once in the frequency domain
+    # (zero-padded to a power of two: fast FFT sizes, no wrap-around)
+    n_fft = 1 << (2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(samples, n=n_fft, axis=0)
+    spectrum *= k_weighting(n_fft, rate)[:, None]
+    weighted = np.fft.irfft(spectrum, n=n_fft, axis=0)[:n]
+
+    # Mean square per 400 ms block (75 % overlap) from one cumulative sum
+    block = min(int(BLOCK_SECONDS * rate), n)
+    step = max(int(BLOCK_STEP_SECONDS * rate), 1)
+    energy = np.concatenate([np.zeros((1, samples.shape[1])),
+                             np.cumsum(np.square(weighted), axis=0)])
+    starts = np.arange(0, n - block + 1, step)
+    block_power = ((energy[starts + block] - energy[starts]) / block).sum(axis=1)
+
+    with np.errstate(divide="ignore"):
+        block_lufs = -0.691 + 10 * np.log10(block_power)
+
+    gated = block_lufs > ABSOLUTE_GATE_LUFS
+    if not gated.any():
+        return float("-inf")
+    relative_gate = -0.691 + 10 * np.log10(block_power[gated].mean()) + RELATIVE_GATE_LU
+    gated &= block_lufs > relative_gate
+    return float(-0.691 + 10 * np.log10(block_power[gated].mean()))
+
+
+def leading_silence(samples, rate, threshold_db=SILENCE_THRESHOLD_DB, frame_ms=10):
+    """Number of sample frames of silence at the start of samples."""
+    frame = max(int(rate * frame_ms / 1000), 1)
+    n_frames = samples.shape[0] // frame
+    if n_frames == 0:
+        return 0
+    frames = samples[:n_frames * frame].reshape(n_frames, frame, -1)
+    power = np.mean(np.square(frames, dtype=np.float64), axis=(1, 2))
+    loud = power > 10 ** (threshold_db / 10)
+    if not loud.any():
+        return 0                         # all silent: keep the clip as it is
+    return int(np.argmax(loud)) * frame
+
+
+# ──────────────────────────────────────────────────────────
+#  NORMALIZATION
+# ──────────────────────────────────────────────────────────
+
+def normalize_clip(segment, duration_ms, target_lufs=TARGET_LUFS,
+                   silence_threshold_db=SILENCE_THRESHOLD_DB):
+    """
+    Trim leading silence from segment, cut the first duration_ms and apply
+    gain so the clip reaches target_lufs (limited so peaks stay below
+    PEAK_CEILING_DB).
+    Returns: (clip AudioSegment, analysis dict)
+    """
+    # Only the part that can end up in the clip is converted to NumPy
+    samples, segment = segment_to_array(segment[:duration_ms + MAX_LEADING_SILENCE_MS])
+    rate = segment.frame_rate
+
+    start = leading_silence(samples, rate, silence_threshold_db)
+    clip = samples[start:start + int(rate * duration_ms / 1000)]
+
+    loudness = integrated_loudness(clip, rate)
+    peak = float(np.max(np.abs(clip))) if clip.size else 0.0
+    gain_db = target_lufs - loudness if np.isfinite(loudness) else 0.0
+    if peak > 0:
+        gain_db = min(gain_db, PEAK_CEILING_DB - 20 * np.log10(peak))
+
+    clip = clip * np.float32(10 ** (gain_db / 20))
+
+    info = {
+        "leading_silence_seconds": start / rate,
+        "loudness_lufs": loudness,
+        "rms_dbfs": rms_dbfs(clip),
+        "gain_db": float(gain_db),
+    }
+    return array_to_segment(clip, segment), info
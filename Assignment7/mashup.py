@@ -0,0 +1,791 @@
+"""
+YouTube Audio Mashup library
+Downloads N videos from a singer, converts to audio, cuts first Y seconds, and merges them.
+
+The pipeline stages can be used on their own, or through MashupBuilder which
+runs the whole pipeline and returns a MashupResult instead of exiting:
+
+    builder = MashupBuilder()
+    result = builder.build("Sharry Maan", 20, 25, "mashup.mp3")
+    print(result.stats["stages"])          # per-stage timing and throughput
+
+    jobs = load_batch_manifest("jobs.csv")
+    results = builder.build_many(jobs, max_workers=4)
+"""
+
+import os
+import csv
+import json
+import shutil
+import functools
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from yt_dlp import YoutubeDL
+from pydub import AudioSegment
+import ffmpeg_downloader as ffdl
+from media_cache import MediaCache, video_id_from_path
+from job_manifest import JobManifest, MANIFEST_FILE
+from instrumentation import PipelineTracer, NULL_TRACER
+from loudness import normalize_clip
+
+
+class MashupError(Exception):
+    """Raised when a mashup cannot be created. Carries the job manifest path
+    (if any) so the caller can offer to resume."""
+
+    def __init__(self, message, job_path=None):
+        super().__init__(message)
+        self.job_path = job_path
+
+
+class MashupResult:
+    """Outcome of one mashup job (error is None on success)"""
+
+    def __init__(self, singer_name, output_file, clips=0, duration_seconds=0.0,
+                 size_bytes=0, error=None, stats=None, skipped=0):
+        self.singer_name = singer_name
+        self.output_file = output_file
+        self.clips = clips
+        self.duration_seconds = duration_seconds
+        self.size_bytes = size_bytes
+        self.error = error
+        self.stats = stats
+        self.skipped = skipped          # downloaded videos left out because a stage failed
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"MashupResult({self.singer_name!r}, {self.output_file!r}, {status})"
+
+
+def parameter_error(num_videos, audio_duration):
+    """
+    Check the assignment constraints on a job
+    Returns: error message, or None if the parameters are valid
+    """
+    if num_videos <= 10:
+        return "Number of videos must be greater than 10."
+    if audio_duration <= 20:
+        return "Audio duration must be greater than 20 seconds."
+    return None
+
+
+def download_videos(singer_name, num_videos, cache=None, job=None, work_dir=".",
+                    tracer=NULL_TRACER):
+    """
+    Download videos from YouTube for the specified singer.
+    If a media cache is given, a repeated search is served from the cache
+    without touching the network, and fresh downloads are added to it.
+    A resumed job reuses finished downloads and lets yt-dlp continue
+    partial ones instead of starting over.
+    Returns: list of downloaded video file paths
+    """
+    print(f"\n[1/4] Searching and downloading {num_videos} videos for '{singer_name}'...")
+
+    if job is not None and job.videos():
+        print(f"Resuming: {len(job.videos())} videos were already downloaded")
+        return job.videos()
+    
+    # YouTube search query
+    search_query = f"ytsearch{num_videos}:{singer_name}"
+
+    # Create downloads directory (kept as-is when resuming so partial downloads continue)
+    download_dir = os.path.join(work_dir, "downloads")
+    if os.path.exists(download_dir) and not (job is not None and job.resumed):
+        shutil.rmtree(download_dir)
+    os.makedirs(download_dir, exist_ok=True)
+
+    if cache is not None:
+        # Linked into this job's directory, so eviction by another run cannot remove them
+        cached_files = cache.get_search(search_query, dest_dir=download_dir)
+        if cached_files:
+            print(f"Found {len(cached_files)} cached downloads for '{singer_name}' (no download needed)")
+            if job is not None:
+                job.set_videos(cached_files)
+            return cached_files
+
+    # The search as a whole is its own stage; the per-file "download" events
+    # (with their bytes) come from the yt-dlp progress hook
+    with tracer.span("fetch", singer_name) as ev:
+        video_files = fetch_videos(search_query, download_dir,
+                                   progress_hooks=[tracer.download_hook(singer_name)])
+        ev["files"] = len(video_files)
+    # Skip partial downloads left behind by an interrupted yt-dlp run
+    video_files = [f for f in video_files if not f.endswith((".part", ".ytdl"))]
+
+    if cache is not None and video_files:
+        for f in video_files:
+            cache.put_raw(f, move=False)            # the job keeps working on its own copy
+        cache.put_search(search_query, [video_id_from_path(f) for f in video_files])
+        print(f"Added {len(video_files)} downloads to the media cache ({cache.root})")
+
+    if job is not None and video_files:
+        job.set_videos(video_files)
+
+    return video_files
+
+
+@functools.lru_cache(maxsize=None)
+def get_download_context():
+    """
+    Detect the JavaScript runtime and cookie file used by yt-dlp.
+    Done once per process and shared by every download.
+    Returns: (js_runtimes, cookie_file)
+    """
+    # yt-dlp requires an external JS runtime for full YouTube support.
+    # In the Python API, js_runtimes must be a dict: {runtime: {config}}.
+    js_runtimes = None
+    if shutil.which('node'):
+        js_runtimes = {'node': {}}
+        print("Using JavaScript runtime: node (required for YouTube extraction).")
+    elif shutil.which('deno'):
+        js_runtimes = {'deno': {}}
+        print("Using JavaScript runtime: deno (default).")
+    else:
+        print("WARNING: No JavaScript runtime found (node/deno). YouTube downloads may fail.")
+
+    # Manual cookie file: check in current directory and script directory
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    cookie_file = None
+    for path in ["cookies.txt", os.path.join(script_dir, "cookies.txt"), os.path.join(os.getcwd(), "cookies.txt")]:
+        if os.path.exists(path):
+            cookie_file = os.path.abspath(path)
+            break
+
+    return js_runtimes, cookie_file
+
+
+# One YoutubeDL per option set per thread: build_many's workers reuse their
+# instances (and the cookies/extractors they have loaded) across jobs and
+# fallback attempts. Only the output directory and progress hooks change.
+_ydl_local = threading.local()
+
+
+def _dispatch_progress(status):
+    for hook in getattr(_ydl_local, "hooks", ()):
+        hook(status)
+
+
+@contextlib.contextmanager
+def reused_ydl(ydl_opts, download_dir, progress_hooks=()):
+    """
+    Yield this thread's YoutubeDL for ydl_opts (created on first use),
+    writing into download_dir and reporting to progress_hooks.
+    """
+    instances = getattr(_ydl_local, "instances", None)
+    if instances is None:
+        instances = _ydl_local.instances = {}
+    key = json.dumps(ydl_opts, sort_keys=True, default=str)
+    ydl = instances.get(key)
+    if ydl is None:
+        ydl = instances[key] = YoutubeDL({**ydl_opts, 'progress_hooks': [_dispatch_progress]})
+    ydl.params['paths'] = {'home': download_dir}
+    _ydl_local.hooks = tuple(progress_hooks)
+    try:
+        yield ydl
+    finally:
+        _ydl_local.hooks = ()
+
+
+def fetch_videos(search_query, download_dir, progress_hooks=()):
+    """
+    Run the YouTube search/download into download_dir, trying cookie files,
+    browser cookies and alternative player clients in turn.
+    progress_hooks are passed on to yt-dlp (used for per-file timing).
+    Returns: list of downloaded video file paths
+    """
+    js_runtimes, cookie_file = get_download_context()
+    
+    # Try manual cookie file FIRST if it exists (most reliable)
+    if cookie_file:
+        print(f"\nUsing manual cookie file ({cookie_file})...")
+        print(f"Cookie file found at: {os.path.abspath(cookie_file)}")
+        try:
+            ydl_opts = {
+                'format': 'bestaudio/best',
+                # Use safe ASCII filenames to avoid encoding/locking issues
+                'outtmpl': '%(id)s.%(ext)s',
+                'restrictfilenames': True,
+                'quiet': False,
+                'no_warnings': False,
+                **({'js_runtimes': js_runtimes} if js_runtimes else {}),
+                'cookiefile': cookie_file,
+                'retries': 3,
+                'fragment_retries': 3,
+                # Use 'web' client with cookies (Android doesn't support cookies)
+                'extractor_args': {
+                    'youtube': {
+                        'player_client': ['web'],  # Web client supports cookies
+                    }
+                },
+            }
+            
+            with reused_ydl(ydl_opts, download_dir, progress_hooks) as ydl:
+                info = ydl.extract_info(search_query, download=True)
+                
+                downloaded_files = []
+                if info and 'entries' in info:
+                    for entry in info['entries']:
+                        if entry:
+                            title = entry.get('title', 'video')
+                            for file in os.listdir(download_dir):
+                                if file.startswith(title[:50]):
+                                    downloaded_files.append(os.path.join(download_dir, file))
+                                    break
+                
+                if downloaded_files:
+                    print(f"Successfully downloaded {len(downloaded_files)} videos using cookie file")
+                    return downloaded_files
+                else:
+                    all_files = [os.path.join(download_dir, f) for f in os.listdir(download_dir) 
+                                if os.path.isfile(os.path.join(download_dir, f))]
+                    if all_files:
+                        print(f"Successfully downloaded {len(all_files)} videos using cookie file")
+                        return all_files
+        except Exception as e:
+            error_msg = str(e).lower()
+            if "format is not available" in error_msg or "requested format" in error_msg:
+                print(f"Web client with cookies failed: Format not available.")
+                print("Trying without specifying player client (let yt-dlp choose)...")
+                # Try without specifying client - let yt-dlp choose the best one
+                try:
+                    ydl_opts_no_client = {
+                        'format': 'bestaudio/best',
+                        'outtmpl': '%(id)s.%(ext)s',
+                        'restrictfilenames': True,
+                        'quiet': False,
+                        'no_warnings': False,
+                        **({'js_runtimes': js_runtimes} if js_runtimes else {}),
+                        'cookiefile': cookie_file,
+                        'retries': 3,
+                        'fragment_retries': 3,
+                    }
+                    with reused_ydl(ydl_opts_no_client, download_dir, progress_hooks) as ydl:
+                        info = ydl.extract_info(search_query, download=True)
+                        all_files = [os.path.join(download_dir, f) for f in os.listdir(download_dir) 
+                                    if os.path.isfile(os.path.join(download_dir, f))]
+                        if all_files:
+                            print(f"Successfully downloaded {len(all_files)} videos using cookies (auto client)")
+                            return all_files
+                except Exception as e2:
+                    print(f"Auto client selection also failed: {str(e2)[:150]}")
+            elif "bot" in error_msg or "sign in" in error_msg:
+                print(f"Cookie file failed: Still detected as bot.")
+                print("Trying with different player clients...")
+                
+                # Try with different clients using the same cookie file
+                for client in ['ios']:
+                    try:
+                        print(f"  Trying {client} client with cookies...")
+                        ydl_opts['extractor_args'] = {
+                            'youtube': {
+                                'player_client': [client],
+                            }
+                        }
+                        with reused_ydl(ydl_opts, download_dir, progress_hooks) as ydl:
+                            info = ydl.extract_info(search_query, download=True)
+                            all_files = [os.path.join(download_dir, f) for f in os.listdir(download_dir) 
+                                        if os.path.isfile(os.path.join(download_dir, f))]
+                            if all_files:
+                                print(f"Successfully downloaded {len(all_files)} videos using {client} client with cookies")
+                                return all_files
+                    except Exception as e2:
+                        print(f"  {client} client also failed: {str(e2)[:100]}")
+                        continue
+                
+                print("\nAll methods with cookies failed. Possible reasons:")
+                print("  1. Cookies may be expired - export fresh cookies from browser")
+                print("  2. YouTube is temporarily blocking - wait 10-15 minutes and try again")
+                print("  3. Need to be logged into YouTube when exporting cookies")
+            else:
+                # Avoid printing full exception message to sidestep Unicode console issues
+                print("Cookie file method failed (see yt-dlp logs above for details).")
+                # Try one more time without specifying client
+                try:
+                    print("Retrying without specifying player client...")
+                    ydl_opts_simple = {
+                        'format': 'bestaudio/best',
+                        'outtmpl': '%(id)s.%(ext)s',
+                        'restrictfilenames': True,
+                        'quiet': False,
+                        **({'js_runtimes': js_runtimes} if js_runtimes else {}),
+                        'cookiefile': cookie_file,
+                        'retries': 3,
+                    }
+                    with reused_ydl(ydl_opts_simple, download_dir, progress_hooks) as ydl:
+                        info = ydl.extract_info(search_query, download=True)
+                        all_files = [os.path.join(download_dir, f) for f in os.listdir(download_dir) 
+                                    if os.path.isfile(os.path.join(download_dir, f))]
+                        if all_files:
+                            print(f"Successfully downloaded {len(all_files)} videos")
+                            return all_files
+                except:
+                    pass
+    
+    # If cookie file doesn't exist or failed, try browser cookies
+    browsers_to_try = ['firefox', 'edge', 'chrome']
+    
+    for browser in browsers_to_try:
+        print(f"\nTrying with {browser} browser cookies...")
+        try:
+            ydl_opts = {
+                'format': 'bestaudio/best',
+                'outtmpl': '%(id)s.%(ext)s',
+                'restrictfilenames': True,
+                'quiet': False,
+                'no_warnings': False,
+                'extract_flat': False,
+                **({'js_runtimes': js_runtimes} if js_runtimes else {}),
+                'cookiesfrombrowser': (browser,),
+                'retries': 3,
+                'fragment_retries': 3,
+            }
+            
+            with reused_ydl(ydl_opts, download_dir, progress_hooks) as ydl:
+                info = ydl.extract_info(search_query, download=True)
+                
+                downloaded_files = []
+                if info and 'entries' in info:
+                    for entry in info['entries']:
+                        if entry:
+                            title = entry.get('title', 'video')
+                            for file in os.listdir(download_dir):
+                                if file.startswith(title[:50]):
+                                    downloaded_files.append(os.path.join(download_dir, file))
+                                    break
+                
+                if downloaded_files:
+                    print(f"Successfully downloaded {len(downloaded_files)} videos using {browser} cookies")
+                    return downloaded_files
+                else:
+                    all_files = [os.path.join(download_dir, f) for f in os.listdir(download_dir) 
+                                if os.path.isfile(os.path.join(download_dir, f))]
+                    if all_files:
+                        print(f"Found {len(all_files)} downloaded files")
+                        return all_files
+        except Exception as e:
+            error_msg = str(e).lower()
+            if "cookie" in error_msg or "could not copy" in error_msg:
+                print(f"  {browser} cookies unavailable, trying next browser...")
+                continue
+            elif "bot" in error_msg or "sign in" in error_msg:
+                print(f"  {browser} cookies failed: Still detected as bot")
+                continue
+            else:
+                all_files = [os.path.join(download_dir, f) for f in os.listdir(download_dir) 
+                            if os.path.isfile(os.path.join(download_dir, f))]
+                if all_files:
+                    print(f"Found {len(all_files)} downloaded files despite error")
+                    return all_files
+    
+    # Last resort: Try different player clients without cookies
+    print("\nTrying player clients without cookies...")
+    player_clients = ['android', 'ios']
+    
+    for client in player_clients:
+        print(f"\nTrying with {client} client...")
+        ydl_opts = {
+            'format': 'bestaudio/best',
+            'outtmpl': '%(id)s.%(ext)s',
+            'restrictfilenames': True,
+            'quiet': False,
+            'no_warnings': False,
+            **({'js_runtimes': js_runtimes} if js_runtimes else {}),
+            'extractor_args': {
+                'youtube': {
+                    'player_client': [client],
+                }
+            },
+            'retries': 3,
+            'fragment_retries': 3,
+        }
+        
+        try:
+            with reused_ydl(ydl_opts, download_dir, progress_hooks) as ydl:
+                info = ydl.extract_info(search_query, download=True)
+                all_files = [os.path.join(download_dir, f) for f in os.listdir(download_dir) 
+                            if os.path.isfile(os.path.join(download_dir, f))]
+                if all_files:
+                    print(f"Successfully downloaded {len(all_files)} videos using {client} client")
+                    return all_files
+        except Exception as e:
+            error_msg = str(e).lower()
+            if "bot" in error_msg or "sign in" in error_msg:
+                print(f"  {client} client failed: Bot detection")
+                continue
+    
+    # All methods failed
+    print("\n" + "="*70)
+    print("All download methods failed due to YouTube bot detection.")
+    print("="*70)
+    print("\nSOLUTION: Export cookies from your browser manually:")
+    print("\nMethod 1 - Using Browser Extension (Easiest):")
+    print("  1. Install 'Get cookies.txt LOCALLY' extension in Chrome/Firefox")
+    print("  2. Go to youtube.com and log in")
+    print("  3. Click the extension icon -> Export -> Save as 'cookies.txt'")
+    print("  4. Place cookies.txt in the same folder as this script")
+    print("  5. Run the script again")
+    print("\nMethod 2 - Using yt-dlp command:")
+    print("  Run: yt-dlp --cookies-from-browser firefox --print-to-file url cookies.txt")
+    print("\nMethod 3 - Wait and retry:")
+    print("  YouTube may be temporarily blocking. Wait 10-15 minutes and try again.")
+    print("\nMethod 4 - Install Node.js:")
+    print("  Download from https://nodejs.org/ and install")
+    print("  This helps yt-dlp bypass some YouTube restrictions")
+    print("="*70)
+    
+    return []
+
+
+@functools.lru_cache(maxsize=None)
+def configure_ffmpeg():
+    """Ensure ffmpeg/ffprobe are available for pydub (done once per process)"""
+    try:
+        ffmpeg_path = ffdl.ffmpeg_path
+        ffprobe_path = ffdl.ffprobe_path
+        if ffmpeg_path and ffprobe_path:
+            # Make sure ffmpeg/ffprobe are discoverable via PATH (pydub uses `which("ffprobe")`)
+            ffmpeg_bin_dir = os.path.dirname(ffmpeg_path)
+            current_path = os.environ.get("PATH", "")
+            if ffmpeg_bin_dir and ffmpeg_bin_dir not in current_path.split(os.pathsep):
+                os.environ["PATH"] = os.pathsep.join([ffmpeg_bin_dir, current_path])
+
+            AudioSegment.converter = ffmpeg_path
+            AudioSegment.ffmpeg = ffmpeg_path
+            AudioSegment.ffprobe = ffprobe_path
+            print(f"Using ffmpeg at: {ffmpeg_path}")
+        else:
+            print("Warning: ffmpeg binaries not found via ffmpeg-downloader; conversion may fail.")
+    except Exception as e:
+        print(f"Warning: Could not configure ffmpeg for pydub: {e}")
+
+
+def convert_to_audio(video_files, cache=None, job=None, work_dir=".", tracer=NULL_TRACER):
+    """
+    Convert video files to audio (mp3).
+    Videos already converted in an earlier run are taken from the media cache
+    or, when resuming, from the job manifest.
+    Returns: list of audio file paths
+    """
+    print(f"\n[2/4] Converting {len(video_files)} videos to audio...")
+
+    configure_ffmpeg()
+    
+    audio_dir = os.path.join(work_dir, "audio_files")
+    if os.path.exists(audio_dir) and not (job is not None and job.resumed):
+        shutil.rmtree(audio_dir)
+    os.makedirs(audio_dir, exist_ok=True)
+    
+    audio_files = []
+    
+    for i, video_file in enumerate(video_files):
+        tracer.progress("convert", i, len(video_files))
+        try:
+            video_id = video_id_from_path(video_file)
+            done_path = job.done("converted", video_id) if job is not None else None
+            if done_path:
+                print(f"Converting {i+1}/{len(video_files)}: {os.path.basename(video_file)} (already done)")
+                audio_files.append(done_path)
+                continue
+
+            if cache is not None:
+                cached_path = cache.get_audio(video_id, "mp3", dest_dir=audio_dir)
+                if cached_path:
+                    print(f"Converting {i+1}/{len(video_files)}: {os.path.basename(video_file)} (cached)")
+                    if job is not None:
+                        job.mark("converted", video_id, cached_path)
+                    audio_files.append(cached_path)
+                    continue
+
+            print(f"Converting {i+1}/{len(video_files)}: {os.path.basename(video_file)}")
+            
+            # Load audio from video file
+            with tracer.span("decode", video_id, bytes=os.path.getsize(video_file)):
+                audio = AudioSegment.from_file(video_file)
+            
+            # Export as mp3 (named by video ID so later stages can find it in the cache)
+            audio_filename = f"{video_id}.mp3"
+            audio_path = os.path.join(audio_dir, audio_filename)
+            with tracer.span("encode", video_id, audio_seconds=len(audio) / 1000) as ev:
+                audio.export(audio_path, format="mp3")
+                ev["bytes"] = os.path.getsize(audio_path)
+
+            if cache is not None:
+                cache.put_audio(audio_path, video_id, "mp3", move=False)
+            if job is not None:
+                job.mark("converted", video_id, audio_path)
+            
+            audio_files.append(audio_path)
+            
+        except Exception as e:
+            print(f"Error converting {video_file}: {e}")
+            continue
+    
+    tracer.progress("convert", len(video_files), len(video_files))
+    print(f"Successfully converted {len(audio_files)} files to audio")
+    if len(audio_files) < len(video_files):
+        print(f"Warning: {len(video_files) - len(audio_files)} of {len(video_files)} videos "
+              f"could not be converted and are left out of the mashup")
+    return audio_files
+
+
+def cut_audio_clips(audio_files, duration_seconds, cache=None, job=None, work_dir=".",
+                    tracer=NULL_TRACER, normalize=None):
+    """
+    Cut first Y seconds from each audio file.
+    If normalize is a loudness target in LUFS, leading silence is trimmed
+    first and each clip is gained to that loudness (see loudness.py).
+    With a media cache, each trimmed clip is kept as PCM (wav) keyed by
+    video ID and clip duration, so it is never decoded and cut twice.
+    With a job manifest, clips are saved to disk so a resumed run can reuse them.
+    Returns: list of cut audio segments
+    """
+    print(f"\n[3/4] Cutting first {duration_seconds} seconds from each audio file...")
+    
+    cut_clips = []
+    duration_ms = duration_seconds * 1000  # Convert to milliseconds
+    clip_dir = os.path.join(work_dir, "audio_files")
+    os.makedirs(clip_dir, exist_ok=True)
+
+    # Cache key parameters: normalized clips are cached separately
+    clip_params = {"duration": duration_seconds}
+    if normalize is not None:
+        clip_params["loudness"] = normalize
+    
+    for i, audio_file in enumerate(audio_files):
+        tracer.progress("cut", i, len(audio_files))
+        try:
+            video_id = video_id_from_path(audio_file)
+            done_clip = job.done("cut", video_id) if job is not None else None
+            if done_clip:
+                print(f"Processing {i+1}/{len(audio_files)}: {os.path.basename(audio_file)} (already done)")
+                cut_clips.append(AudioSegment.from_wav(done_clip))
+                continue
+
+            if cache is not None:
+                cached_clip = cache.get_audio(video_id, "wav", dest_dir=clip_dir, **clip_params)
+                if cached_clip:
+                    print(f"Processing {i+1}/{len(audio_files)}: {os.path.basename(audio_file)} (cached)")
+                    if job is not None:
+                        job.mark("cut", video_id, cached_clip)
+                    cut_clips.append(AudioSegment.from_wav(cached_clip))
+                    continue
+
+            print(f"Processing {i+1}/{len(audio_files)}: {os.path.basename(audio_file)}")
+            
+            # Load audio
+            with tracer.span("decode", video_id, bytes=os.path.getsize(audio_file)):
+                audio = AudioSegment.from_mp3(audio_file)
+            
+            # Cut first Y seconds (after silence trimming and gain when normalizing)
+            if normalize is not None:
+                with tracer.span("normalize", video_id) as ev:
+                    cut_audio, analysis = normalize_clip(audio, duration_ms, target_lufs=normalize)
+                    ev.update(analysis)
+                    ev["bytes"] = len(cut_audio.raw_data)
+            else:
+                with tracer.span("cut", video_id) as ev:
+                    cut_audio = audio[:duration_ms]
+                    ev["bytes"] = len(cut_audio.raw_data)
+
+            if cache is not None or job is not None:
+                clip_path = os.path.join(clip_dir, f"{video_id}_clip.wav")
+                with tracer.span("encode", video_id, format="wav") as ev:
+                    cut_audio.export(clip_path, format="wav")
+                    ev["bytes"] = os.path.getsize(clip_path)
+                if cache is not None:
+                    cache.put_audio(clip_path, video_id, "wav", move=False, **clip_params)
+                if job is not None:
+                    job.mark("cut", video_id, clip_path)
+            
+            cut_clips.append(cut_audio)
+            
+        except Exception as e:
+            print(f"Error cutting audio {audio_file}: {e}")
+            continue
+    
+    tracer.progress("cut", len(audio_files), len(audio_files))
+    print(f"Successfully cut {len(cut_clips)} audio clips")
+    if len(cut_clips) < len(audio_files):
+        print(f"Warning: {len(audio_files) - len(cut_clips)} of {len(audio_files)} audio files "
+              f"could not be cut and are left out of the mashup")
+    return cut_clips
+
+
+def merge_audio_clips(audio_clips, output_file, tracer=NULL_TRACER):
+    """
+    Merge all audio clips into a single output file
+    """
+    print(f"\n[4/4] Merging {len(audio_clips)} audio clips into '{output_file}'...")
+    
+    try:
+        # Combine all clips
+        merged_audio = AudioSegment.empty()
+        
+        with tracer.span("merge", output_file):
+            for i, clip in enumerate(audio_clips):
+                print(f"Merging clip {i+1}/{len(audio_clips)}")
+                merged_audio += clip
+        
+        # Export merged audio
+        with tracer.span("encode", output_file, format="mp3") as ev:
+            merged_audio.export(output_file, format="mp3")
+            ev["bytes"] = os.path.getsize(output_file)
+        
+        print(f"\n✓ Successfully created mashup: {output_file}")
+        print(f"  Total duration: {len(merged_audio) / 1000:.2f} seconds")
+        print(f"  File size: {os.path.getsize(output_file) / (1024*1024):.2f} MB")
+        
+        return True
+        
+    except Exception as e:
+        print(f"Error merging audio clips: {e}")
+        return False
+
+
+def cleanup_temp_files(work_dir="."):
+    """Clean up temporary directories"""
+    print("\nCleaning up temporary files...")
+    
+    for name in ["downloads", "audio_files"]:
+        directory = os.path.join(work_dir, name)
+        if os.path.exists(directory):
+            try:
+                shutil.rmtree(directory)
+            except Exception as e:
+                # Avoid printing full exception (may contain non-encodable chars on Windows)
+                print(f"Warning: Could not remove {name}.")
+
+
+# ──────────────────────────────────────────────────────────
+#  LIBRARY API
+# ──────────────────────────────────────────────────────────
+
+class MashupBuilder:
+    """
+    Runs the mashup pipeline in-process. ffmpeg configuration, the yt-dlp
+    download context (JS runtime, cookies) and the media cache are set up
+    once and shared by every job built with the same builder. Each job gets
+    a child of the builder's PipelineTracer, so MashupResult.stats covers
+    that job only while the builder's tracer collects the whole batch.
+    """
+
+    def __init__(self, cache=None, use_cache=True, work_root=".", tracer=None):
+        if cache is None and use_cache:
+            cache = MediaCache()
+        self.cache = cache
+        self.work_root = work_root
+        self.tracer = tracer or PipelineTracer()
+        configure_ffmpeg()
+
+    def build(self, singer_name, num_videos, audio_duration, output_file,
+              resume=False, work_dir=None, normalize=None):
+        """
+        Create one mashup. normalize is an optional loudness target in LUFS.
+        Returns: MashupResult
+        Raises: MashupError if a stage produces nothing; progress is kept in
+                the job manifest so the job can be resumed.
+        """
+        error = parameter_error(num_videos, audio_duration)
+        if error:
+            raise MashupError(error)
+
+        work_dir = work_dir or self.work_root
+        os.makedirs(work_dir, exist_ok=True)
+        job = JobManifest.open(
+            {"singer": singer_name, "num_videos": num_videos, "duration": audio_duration,
+             "normalize": normalize},
+            resume=resume, work_dir=work_dir,
+        )
+        if job.resumed:
+            done = job.progress()
+            print(f"Resuming job: {done['downloaded']} downloaded, "
+                  f"{done['converted']} converted, {done['cut']} cut")
+
+        tracer = self.tracer.child()
+        video_files = download_videos(singer_name, num_videos, self.cache, job, work_dir, tracer)
+        if not video_files:
+            raise MashupError("No videos were downloaded.", job.path)
+
+        audio_files = convert_to_audio(video_files, self.cache, job, work_dir, tracer)
+        if not audio_files:
+            raise MashupError("No audio files were created.", job.path)
+
+        cut_clips = cut_audio_clips(audio_files, audio_duration, self.cache, job, work_dir,
+                                    tracer, normalize)
+        if not cut_clips:
+            raise MashupError("No audio clips were cut.", job.path)
+
+        if not merge_audio_clips(cut_clips, output_file, tracer):
+            raise MashupError("Failed to create mashup.", job.path)
+
+        # The job is finished, nothing left to resume
+        cleanup_temp_files(work_dir)
+        job.remove()
+
+        return MashupResult(
+            singer_name, output_file,
+            clips=len(cut_clips),
+            skipped=len(video_files) - len(cut_clips),
+            duration_seconds=sum(len(clip) for clip in cut_clips) / 1000,
+            size_bytes=os.path.getsize(output_file),
+            stats=tracer.summary(),
+        )
+
+    def build_many(self, jobs, max_workers=4, resume=False, normalize=None):
+        """
+        Create several mashups concurrently. Each job is a dict with keys
+        singer, num_videos, duration and output, and runs in its own work
+        directory under work_root.
+        Returns: list of MashupResult in the same order as jobs
+        """
+        def run(index, job):
+            work_dir = os.path.join(self.work_root, f"mashup_job_{index + 1}")
+            try:
+                result = self.build(job["singer"], job["num_videos"], job["duration"],
+                                    job["output"], resume=resume, work_dir=work_dir,
+                                    normalize=normalize)
+            except Exception as e:
+                return MashupResult(job["singer"], job["output"], error=str(e))
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return result
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(run, i, job) for i, job in enumerate(jobs)]
+            return [f.result() for f in futures]
+
+
+def load_batch_manifest(path):
+    """
+    Read batch jobs from a CSV (header: singer,num_videos,duration,output)
+    or a JSON list of objects with the same keys
+    Returns: list of job dicts
+    Raises: MashupError on a malformed manifest
+    """
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            if path.lower().endswith(".json"):
+                rows = json.load(f)
+            else:
+                rows = list(csv.DictReader(f))
+    except (OSError, ValueError) as e:
+        raise MashupError(f"Could not read batch manifest '{path}': {e}")
+
+    jobs = []
+    for line, row in enumerate(rows, start=1):
+        try:
+            jobs.append({
+                "singer": str(row["singer"]).strip(),
+                "num_videos": int(row["num_videos"]),
+                "duration": int(row["duration"]),
+                "output": str(row["output"]).strip(),
+            })
+        except (KeyError, TypeError, ValueError):
+            raise MashupError(
+                f"Invalid job {line} in batch manifest: expected singer, "
+                f"num_videos, duration and output")
+    return jobs
@@ -0,0 +1,289 @@
+"""
+Persistent media cache for the YouTube Audio Mashup program.
+
+Raw downloads are stored by video ID, processed audio (converted files and
+trimmed clips) by video ID plus the processing parameters that produced them.
+Search results are remembered too, so repeating a request for the same singer
+needs no network access at all. Entries are evicted least-recently-used first
+once the cache grows past its size cap, and every change to the cache is done
+under a file lock so several runs can share one cache directory.
+
+Eviction only removes the cache's own name for a file. Callers that go on
+working with an entry pass dest_dir to get_*(), which hard-links (or copies,
+where links are not possible) the entry into their work directory under the
+lock, and store with move=False so their own file stays in place; another
+run evicting the entry then cannot pull a file from under a running job.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+
+try:
+    import fcntl
+except ImportError:            # Windows
+    fcntl = None
+    import msvcrt
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "yt_mashup")
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024 * 1024       # 5 GB
+
+# Sub-directories holding the cache entries
+RAW_DIR = "raw"
+AUDIO_DIR = "audio"
+SEARCH_DIR = "searches"
+LOCK_FILE = ".lock"
+
+
+class FileLock:
+    """Exclusive inter-process lock on a file (fcntl on POSIX, msvcrt on Windows)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._fh = None
+
+    def __enter__(self):
+        self._fh = open(self.path, "a+")
+        if fcntl is not None:
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX)
+        else:
+            self._fh.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+            else:
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._fh.close()
+            self._fh = None
+
+
+def video_id_from_path(path):
+    """
+    Downloads are saved as '<video_id>.<ext>' and cached audio as
+    '<video_id>.<key>.<fmt>'. YouTube IDs never contain '.', so the ID is
+    everything before the first dot.
+    """
+    return os.path.basename(path).split(".", 1)[0]
+
+
+class MediaCache:
+    """
+    On-disk, content-addressed cache of downloaded and processed media.
+
+    Layout under the cache root:
+        raw/<video_id>.<ext>             original download
+        audio/<video_id>.<key>.<fmt>     processed audio, key = hash of params
+        searches/<hash>.json             video IDs returned for a search query
+    """
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = root or os.environ.get("MASHUP_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_mb = os.environ.get("MASHUP_CACHE_MAX_MB")
+            max_bytes = int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES
+        self.max_bytes = max_bytes
+
+        for sub in (RAW_DIR, AUDIO_DIR, SEARCH_DIR):
+            os.makedirs(os.path.join(self.root, sub), exist_ok=True)
+
+    # ── helpers ─────────────────────────────────────────────
+
+    def _lock(self):
+        return FileLock(os.path.join(self.root, LOCK_FILE))
+
+    @staticmethod
+    def _params_key(params):
+        blob = json.dumps(params, sort_keys=True).encode("utf-8")
+        return hashlib.sha1(blob).hexdigest()[:16]
+
+    @staticmethod
+    def _touch(path):
+        """Mark an entry as recently used (mtime drives LRU eviction)."""
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _link_or_copy(src_path, dest_path):
+        """Hard-link src to dest (no extra disk space), or copy where links are not possible."""
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        try:
+            os.link(src_path, dest_path)
+        except OSError:
+            shutil.copyfile(src_path, dest_path)
+
+    def _checkout(self, path, dest_dir):
+        """Touch a cache entry and, with dest_dir, give the caller its own link to it.
+        Caller must hold the cache lock."""
+        self._touch(path)
+        if dest_dir is None:
+            return path
+        os.makedirs(dest_dir, exist_ok=True)
+        local = os.path.join(dest_dir, os.path.basename(path))
+        self._link_or_copy(path, local)
+        return local
+
+    def _store(self, src_path, dest_path, move):
+        """Move/link a file into the cache atomically (temp file + rename).
+        Caller must hold the cache lock."""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(dest_path), suffix=".tmp")
+        os.close(fd)
+        try:
+            if move:
+                shutil.move(src_path, tmp_path)
+            else:
+                self._link_or_copy(src_path, tmp_path)
+            os.replace(tmp_path, dest_path)
+            # shutil.move keeps the old mtime; a new entry must count as just used
+            self._touch(dest_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # ── raw downloads ───────────────────────────────────────
+
+    def _find_raw(self, video_id):
+        raw_dir = os.path.join(self.root, RAW_DIR)
+        for name in os.listdir(raw_dir):
+            if video_id_from_path(name) == video_id and not name.endswith(".tmp"):
+                return os.path.join(raw_dir, name)
+        return None
+
+    def get_raw(self, video_id, dest_dir=None):
+        """
+        Return the cached download for video_id, or None. With dest_dir the
+        entry is linked into dest_dir and that stable path is returned.
+        """
+        with self._lock():
+            path = self._find_raw(video_id)
+            return self._checkout(path, dest_dir) if path else None
+
+    def put_raw(self, src_path, move=True):
+        """
+        Add a downloaded file to the cache. Returns its path inside the cache.
+        With move=False src_path stays where it is (linked into the cache).
+        """
+        dest = os.path.join(self.root, RAW_DIR, os.path.basename(src_path))
+        with self._lock():
+            self._store(src_path, dest, move)
+            self._evict(keep=dest)
+        return dest
+
+    # ── processed audio ─────────────────────────────────────
+
+    def audio_path(self, video_id, fmt, **params):
+        """Cache path for audio derived from video_id with the given parameters."""
+        key = self._params_key(dict(params, fmt=fmt))
+        return os.path.join(self.root, AUDIO_DIR, f"{video_id}.{key}.{fmt}")
+
+    def get_audio(self, video_id, fmt, dest_dir=None, **params):
+        """
+        Return the cached processed audio file, or None. With dest_dir the
+        entry is linked into dest_dir and that stable path is returned.
+        """
+        path = self.audio_path(video_id, fmt, **params)
+        with self._lock():
+            if os.path.exists(path):
+                return self._checkout(path, dest_dir)
+        return None
+
+    def put_audio(self, src_path, video_id, fmt, move=True, **params):
+        """Add a processed audio file to the cache. Returns its cache path."""
+        dest = self.audio_path(video_id, fmt, **params)
+        with self._lock():
+            self._store(src_path, dest, move)
+            self._evict(keep=dest)
+        return dest
+
+    # ── search results ──────────────────────────────────────
+
+    def _search_path(self, query):
+        digest = hashlib.sha1(query.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, SEARCH_DIR, f"{digest}.json")
+
+    def get_search(self, query, dest_dir=None):
+        """
+        Return cached download paths for a search query, or None if the query
+        has not been seen or any of its downloads has since been evicted.
+        With dest_dir every download is linked into dest_dir (see get_raw).
+        """
+        path = self._search_path(query)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                video_ids = json.load(f)["video_ids"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+        with self._lock():
+            found = [self._find_raw(video_id) for video_id in video_ids]
+            if not found or None in found:
+                return None
+            return [self._checkout(path, dest_dir) for path in found]
+
+    def put_search(self, query, video_ids):
+        path = self._search_path(query)
+        with self._lock():
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"query": query, "video_ids": list(video_ids)}, f)
+            os.replace(tmp_path, path)
+
+    # ── eviction ────────────────────────────────────────────
+
+    def size(self):
+        total = 0
+        for sub in (RAW_DIR, AUDIO_DIR):
+            for entry in os.scandir(os.path.join(self.root, sub)):
+                if entry.is_file():
+                    total += entry.stat().st_size
+        return total
+
+    def _evict(self, keep=None):
+        """Delete least-recently-used entries until the cache fits max_bytes,
+        never the entry keep (the one just stored). Caller must hold the cache lock."""
+        entries = []
+        total = 0
+        for sub in (RAW_DIR, AUDIO_DIR):
+            for entry in os.scandir(os.path.join(self.root, sub)):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and os.path.abspath(path) == os.path.abspath(keep):
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+
+    def evict(self):
+        with self._lock():
+            self._evict()
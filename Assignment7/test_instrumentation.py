@@ -0,0 +1,42 @@
+"""
+Tests for the pipeline tracer, driving the yt-dlp progress hook with
+synthetic events (no network or yt-dlp needed).
+
+Run from this directory:
+  python -m pytest test_instrumentation.py
+"""
+
+import pytest
+
+from instrumentation import PipelineTracer
+
+
+def _finished(video_id, size, elapsed):
+    return {"status": "finished", "total_bytes": size, "elapsed": elapsed,
+            "filename": f"/tmp/{video_id}.webm", "info_dict": {"id": video_id}}
+
+
+def test_download_hook_counts_each_file_once():
+    tracer = PipelineTracer()
+    with tracer.span("fetch", "singer") as ev:
+        hook = tracer.download_hook("singer")
+        hook({"status": "downloading", "downloaded_bytes": 10, "total_bytes": 100})
+        hook(_finished("a", 1000, 0.5))
+        hook(_finished("b", 3000, 1.5))
+        ev["files"] = 2
+
+    stages = tracer.summary()["stages"]
+    assert stages["download"]["count"] == 2
+    assert stages["download"]["bytes"] == 4000
+    assert stages["download"]["busy_seconds"] == pytest.approx(2.0)
+    assert stages["fetch"]["count"] == 1
+    assert stages["fetch"]["bytes"] == 0
+
+
+def test_child_events_reach_parent():
+    batch = PipelineTracer()
+    job = batch.child()
+    job.download_hook("singer")(_finished("a", 500, 0.25))
+
+    assert job.summary()["stages"]["download"]["bytes"] == 500
+    assert batch.summary()["stages"]["download"]["bytes"] == 500
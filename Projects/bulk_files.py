@@ -0,0 +1,276 @@
+"""
+Bulk file-processing engine (generalizes the multithreading1 notebook).
+
+The notebook starts one threading.Thread per file, which means a million
+threads for a million files, no error collection and whole files read into
+memory. This module instead:
+
+  - discovers files lazily with os.scandir (no glob list of every path)
+  - runs tasks on a bounded pool: threads for I/O-bound work, processes for
+    CPU-bound work, with a configurable limit on tasks in flight
+  - transforms large text files in fixed-size chunks (streaming)
+  - records success / error and timing for every file in a report
+
+Usage:
+  python bulk_files.py create created_files --count 10
+  python bulk_files.py upper created_files --workers 16 --report report.csv
+"""
+
+import os
+import sys
+import csv
+import time
+import argparse
+import functools
+import threading
+from collections import namedtuple
+from concurrent.futures import (ThreadPoolExecutor, ProcessPoolExecutor,
+                                FIRST_COMPLETED, wait)
+
+
+CHUNK_SIZE = 1024 * 1024            # 1 MB of text per read in streaming transforms
+
+FileResult = namedtuple("FileResult", ["path", "output", "ok", "error", "seconds", "bytes"])
+
+
+# ──────────────────────────────────────────────────────────
+#  DISCOVERY
+# ──────────────────────────────────────────────────────────
+
+def scan_files(directory, extensions=None, recursive=False, exclude_suffix=None):
+    """
+    Yield paths of regular files in directory using os.scandir.
+
+    extensions     : tuple of lower-case extensions to keep, e.g. (".txt",)
+    recursive      : also walk sub-directories
+    exclude_suffix : skip files whose name (without extension) ends with this,
+                     e.g. "_upper" so outputs are not processed again
+    """
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+                stem, ext = os.path.splitext(entry.name)
+                if extensions and ext.lower() not in extensions:
+                    continue
+                if exclude_suffix and stem.endswith(exclude_suffix):
+                    continue
+                yield entry.path
+
+
+# ──────────────────────────────────────────────────────────
+#  ENGINE
+# ──────────────────────────────────────────────────────────
+
+class BulkReport:
+    """
+    Per-file outcome of a bulk run. Only failures are kept in memory; every
+    result can be streamed to a CSV file as it arrives.
+    """
+
+    def __init__(self, report_path=None):
+        self.succeeded = 0
+        self.failed = 0
+        self.bytes = 0
+        self.errors = []
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+        self._file = None
+        self._writer = None
+        if report_path:
+            self._file = open(report_path, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(FileResult._fields)
+
+    def add(self, result):
+        with self._lock:
+            if result.ok:
+                self.succeeded += 1
+                self.bytes += result.bytes or 0
+            else:
+                self.failed += 1
+                self.errors.append(result)
+            if self._writer:
+                self._writer.writerow(result)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    @property
+    def total(self):
+        return self.succeeded + self.failed
+
+    def summary(self):
+        rate = self.total / self.seconds if self.seconds else 0.0
+        return (f"{self.succeeded} succeeded, {self.failed} failed "
+                f"in {self.seconds:.2f}s ({rate:.0f} files/s)")
+
+
+def _run_one(task, path):
+    """Run task(path) and turn the outcome into a FileResult (never raises)."""
+    start = time.perf_counter()
+    try:
+        output, nbytes = task(path)
+        return FileResult(path, output, True, None, time.perf_counter() - start, nbytes)
+    except Exception as e:
+        return FileResult(path, None, False, f"{type(e).__name__}: {e}",
+                          time.perf_counter() - start, 0)
+
+
+def run_bulk(task, paths, executor="thread", workers=None, max_in_flight=None,
+             report_path=None):
+    """
+    Apply task to every path on a bounded pool.
+
+    task          : callable(path) -> (output_path, bytes_written). Must be a
+                    module-level function (or functools.partial of one) when
+                    executor="process".
+    paths         : iterable of paths (consumed lazily)
+    executor      : "thread" for I/O-bound tasks, "process" for CPU-bound ones
+    workers       : pool size (default: 32 threads or one process per core)
+    max_in_flight : most tasks submitted but not finished (default: 4 × workers);
+                    bounds memory for huge path iterables
+    report_path   : optional CSV file receiving one row per file
+
+    Returns: BulkReport
+    """
+    if executor == "process":
+        workers = workers or os.cpu_count() or 1
+        pool_cls = ProcessPoolExecutor
+    elif executor == "thread":
+        workers = workers or min(32, (os.cpu_count() or 1) * 4)
+        pool_cls = ThreadPoolExecutor
+    else:
+        raise ValueError(f"Unknown executor '{executor}' (use 'thread' or 'process')")
+    max_in_flight = max_in_flight or workers * 4
+
+    report = BulkReport(report_path)
+    start = time.perf_counter()
+    try:
+        with pool_cls(max_workers=workers) as pool:
+            in_flight = set()
+            for path in paths:
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        report.add(future.result())
+                in_flight.add(pool.submit(_run_one, task, path))
+            for future in wait(in_flight).done:
+                report.add(future.result())
+    finally:
+        report.seconds = time.perf_counter() - start
+        report.close()
+    return report
+
+
+# ──────────────────────────────────────────────────────────
+#  TASKS
+# ──────────────────────────────────────────────────────────
+
+def create_text_file(path):
+    """Mini-project 1: write a small numbered text file."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    number = stem.rsplit("_", 1)[-1]
+    content = (f"This is file number {number}\n"
+               f"Created by thread: {threading.current_thread().name}\n")
+    with open(path, "w") as f:
+        f.write(content)
+    return path, len(content)
+
+
+def uppercase_file(path, chunk_size=CHUNK_SIZE, suffix="_upper"):
+    """
+    Mini-project 2: write an upper-case copy of a text file next to it.
+    The file is streamed in chunks so memory use does not depend on its size,
+    and the output appears atomically (temp file + rename).
+    """
+    stem, ext = os.path.splitext(path)
+    output_path = f"{stem}{suffix}{ext}"
+    tmp_path = output_path + ".tmp"
+    written = 0
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as src, \
+                open(tmp_path, "wb") as dst:
+            while True:
+                chunk = src.read(chunk_size)
+                if not chunk:
+                    break
+                # Encoded here so that `written` counts bytes, not characters
+                written += dst.write(chunk.upper().encode("utf-8"))
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return output_path, written
+
+
+# ──────────────────────────────────────────────────────────
+#  COMMAND LINE
+# ──────────────────────────────────────────────────────────
+
+def _print_report(report, label):
+    print(f"\nDone! {label}: {report.summary()}")
+    for result in report.errors[:20]:
+        print(f"  Error: {os.path.basename(result.path)}: {result.error}")
+    if len(report.errors) > 20:
+        print(f"  ... and {len(report.errors) - 20} more errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk file-processing engine")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_pool_args(p):
+        p.add_argument("--executor", choices=("thread", "process"), default="thread")
+        p.add_argument("--workers", type=int, default=None)
+        p.add_argument("--in-flight", type=int, default=None,
+                       help="maximum tasks submitted but not yet finished")
+        p.add_argument("--report", help="write a per-file CSV report here")
+
+    create = sub.add_parser("create", help="create numbered text files")
+    create.add_argument("directory")
+    create.add_argument("--count", type=int, default=10)
+    add_pool_args(create)
+
+    upper = sub.add_parser("upper", help="write upper-case copies of .txt files")
+    upper.add_argument("directory")
+    upper.add_argument("--recursive", action="store_true")
+    upper.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    add_pool_args(upper)
+
+    args = parser.parse_args()
+
+    if args.command == "create":
+        os.makedirs(args.directory, exist_ok=True)
+        paths = (os.path.join(args.directory, f"file_{i}.txt") for i in range(1, args.count + 1))
+        report = run_bulk(create_text_file, paths, args.executor, args.workers,
+                          args.in_flight, args.report)
+        _print_report(report, "files created")
+    else:
+        paths = scan_files(args.directory, extensions=(".txt",), recursive=args.recursive,
+                           exclude_suffix="_upper")
+        task = functools.partial(uppercase_file, chunk_size=args.chunk_size)
+        report = run_bulk(task, paths, args.executor, args.workers, args.in_flight, args.report)
+        if report.total == 0:
+            print("No .txt files found! Run the create command first.")
+        _print_report(report, "files converted to uppercase")
+
+    if report.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Batch greyscale image pipeline.
+
+Decoding and colour conversion are CPU-bound, so threads (as in the notebook's
+convert_to_grey cell) mostly wait on the GIL. This pipeline runs on the bulk
+engine's process pool instead (one worker per core) and per image:
+
+  - uses JPEG draft mode to decode at a reduced scale (1/2, 1/4 or 1/8) when
+    the output only needs to be --max-size pixels, which skips most of the
+    decoding work
+  - converts to greyscale with a NumPy luminance transform
+    (ITU-R 601-2 weights, same fixed-point result as PIL's convert("L"))
+  - writes the result with optimized encoder settings
+
+Usage:
+  python grey_images.py images grey_images [--max-size 512] [--workers 8] [--report report.csv]
+"""
+
+import os
+import sys
+import argparse
+import functools
+import numpy as np
+from PIL import Image           # pip install Pillow
+
+from bulk_files import scan_files, run_bulk
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+# ITU-R 601-2 luma weights in 16.16 fixed point (as used by PIL for "L")
+LUMA_R, LUMA_G, LUMA_B = 19595, 38470, 7471
+
+
+def rgb_to_grey(rgb):
+    """Greyscale of an (H, W, 3) uint8 array: L = R·0.299 + G·0.587 + B·0.114."""
+    rgb = rgb.astype(np.uint32, copy=False)
+    grey = rgb[..., 0] * LUMA_R
+    grey += rgb[..., 1] * LUMA_G
+    grey += rgb[..., 2] * LUMA_B
+    grey += 0x8000                       # round to nearest
+    grey >>= 16
+    return grey.astype(np.uint8)
+
+
+def _save_options(ext, quality, png_compress_level):
+    ext = ext.lower()
+    if ext in (".jpg", ".jpeg"):
+        return {"quality": quality, "optimize": True}
+    if ext == ".png":
+        return {"compress_level": png_compress_level}
+    return {}
+
+
+def convert_to_grey(image_path, output_dir, max_size=None, quality=90, png_compress_level=6):
+    """
+    Write a greyscale copy of image_path to output_dir as <name>_grey<ext>.
+    With max_size, the image is scaled to fit in max_size × max_size.
+    Returns: (output_path, bytes_written)
+    """
+    filename = os.path.basename(image_path)
+    name, ext = os.path.splitext(filename)
+    output_path = os.path.join(output_dir, f"{name}_grey{ext}")
+
+    with Image.open(image_path) as img:
+        if max_size and img.format == "JPEG":
+            # Let the JPEG decoder scale down while decoding (DCT scaling)
+            img.draft("RGB", (max_size, max_size))
+        if img.mode == "L":
+            grey_img = img.copy()
+        else:
+            rgb = np.asarray(img.convert("RGB"))
+            grey_img = Image.fromarray(rgb_to_grey(rgb))  # 2-D uint8 -> mode "L"
+
+    if max_size and max(grey_img.size) > max_size:
+        grey_img.thumbnail((max_size, max_size), Image.LANCZOS)
+
+    grey_img.save(output_path, **_save_options(ext, quality, png_compress_level))
+    return output_path, os.path.getsize(output_path)
+
+
+def convert_directory(images_dir, grey_dir, max_size=None, quality=90, workers=None,
+                      max_in_flight=None, report_path=None, recursive=False):
+    """Convert every image in images_dir on a process pool. Returns the BulkReport."""
+    os.makedirs(grey_dir, exist_ok=True)
+    paths = scan_files(images_dir, extensions=IMAGE_EXTENSIONS, recursive=recursive,
+                       exclude_suffix="_grey")
+    task = functools.partial(convert_to_grey, output_dir=grey_dir,
+                             max_size=max_size, quality=quality)
+    return run_bulk(task, paths, executor="process", workers=workers,
+                    max_in_flight=max_in_flight, report_path=report_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch greyscale image conversion")
+    parser.add_argument("images_dir")
+    parser.add_argument("grey_dir")
+    parser.add_argument("--max-size", type=int, default=None,
+                        help="fit outputs in this many pixels (enables JPEG draft decoding)")
+    parser.add_argument("--quality", type=int, default=90, help="JPEG output quality")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per core")
+    parser.add_argument("--in-flight", type=int, default=None)
+    parser.add_argument("--recursive", action="store_true")
+    parser.add_argument("--report", help="write a per-image CSV report here")
+    args = parser.parse_args()
+
+    report = convert_directory(args.images_dir, args.grey_dir, args.max_size, args.quality,
+                               args.workers, args.in_flight, args.report, args.recursive)
+    if report.total == 0:
+        print(f"No images found! Add images to: {args.images_dir}")
+        return
+
+    print(f"\nDone! {report.summary()}")
+    print(f"  {report.bytes / 1e6:.1f} MB written to {args.grey_dir}")
+    for result in report.errors[:20]:
+        print(f"  Error: {os.path.basename(result.path)}: {result.error}")
+    if report.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""
+Frame-parallel greyscale video converter.
+
+The notebook's convert_video_to_grey handles a whole video on one thread, so
+a single long video is limited to one core. Here each video is:
+
+  1. split into segments that start on keyframes (found with ffprobe), so a
+     worker can seek straight to its segment without decoding what precedes it
+  2. converted segment by segment in parallel worker processes; inside each
+     worker a reader thread decodes frames into NumPy batches while the main
+     thread converts a whole batch to greyscale in one cv2.cvtColor call and
+     encodes it
+  3. stitched back together with ffmpeg's concat demuxer using stream copy
+     (no re-encoding, so the concatenation is lossless)
+
+Frames/s overall and per core are reported for every video.
+
+Usage:
+  python grey_videos.py videos grey_videos [--workers 8] [--batch 32]
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import queue
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import cv2    # pip install opencv-python
+
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov")
+BATCH_SIZE = 32                 # frames decoded and converted together
+SEGMENTS_PER_WORKER = 2         # a little over-splitting evens out the load
+
+
+# ──────────────────────────────────────────────────────────
+#  SEGMENT PLANNING
+# ──────────────────────────────────────────────────────────
+
+def video_info(path):
+    """Return (fps, width, height, frame_count) of a video."""
+    cap = cv2.VideoCapture(path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        cap.release()
+    return fps, width, height, frames
+
+
+def keyframe_indices(path, fps):
+    """
+    Frame indices of the keyframes of the first video stream, via ffprobe.
+    Timestamps are taken relative to the stream's start_time, so frame 0 is
+    the first decoded frame. Returns None if ffprobe is not available.
+    """
+    if not shutil.which("ffprobe"):
+        return None
+    cmd = ["ffprobe", "-v", "error", "-select_streams", "v:0", "-skip_frame", "nokey",
+           "-show_entries", "stream=start_time:frame=pts_time,best_effort_timestamp_time",
+           "-of", "json", path]
+    try:
+        info = json.loads(subprocess.run(cmd, capture_output=True, check=True, text=True).stdout)
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        return None
+    streams = info.get("streams") or [{}]
+    start_time = streams[0].get("start_time")
+    start_time = float(start_time) if start_time not in (None, "N/A") else 0.0
+    indices = set()
+    for frame in info.get("frames", []):
+        t = frame.get("pts_time") or frame.get("best_effort_timestamp_time")
+        if t not in (None, "N/A"):
+            indices.add(max(int(round((float(t) - start_time) * fps)), 0))
+    return sorted(indices) or None
+
+
+def plan_segments(path, num_segments):
+    """
+    Split a video into up to num_segments (start_frame, end_frame) ranges whose
+    starts are keyframes. end_frame of the last segment is None (read to EOF).
+    """
+    fps, _, _, total = video_info(path)
+    if num_segments <= 1 or total <= 0:
+        return [(0, None)]
+
+    keyframes = keyframe_indices(path, fps)
+    if keyframes is None:
+        # No ffprobe: split evenly and rely on the decoder's accurate seeking
+        keyframes = list(range(total))
+
+    # For every ideal boundary pick the nearest keyframe after it
+    candidates = np.asarray(keyframes)
+    starts = {0}
+    for i in range(1, num_segments):
+        target = i * total // num_segments
+        pos = np.searchsorted(candidates, target)
+        if pos < len(candidates) and candidates[pos] < total:
+            starts.add(int(candidates[pos]))
+    starts = sorted(starts)
+    return [(s, e) for s, e in zip(starts, starts[1:] + [None])]
+
+
+# ──────────────────────────────────────────────────────────
+#  SEGMENT WORKER
+# ──────────────────────────────────────────────────────────
+
+def _put(out_queue, item, stop):
+    """Queue item, giving up (returns False) once stop is set."""
+    while not stop.is_set():
+        try:
+            out_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _read_batches(cap, count, batch_size, shape, out_queue, stop):
+    """
+    Reader thread: decode up to count frames into (n, H, W, 3) batches.
+    Stops early when stop is set (the consumer failed).
+    """
+    try:
+        remaining = count if count is not None else float("inf")
+        while remaining > 0 and not stop.is_set():
+            n = int(min(batch_size, remaining))
+            batch = np.empty((n,) + shape, dtype=np.uint8)
+            filled = 0
+            while filled < n:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                batch[filled] = frame
+                filled += 1
+            if filled and not _put(out_queue, batch[:filled], stop):
+                return
+            if filled < n:
+                break
+            remaining -= filled
+        _put(out_queue, None, stop)
+    except BaseException as e:
+        _put(out_queue, e, stop)
+
+
+def open_at(path, start):
+    """
+    Open a video positioned exactly at frame start. CAP_PROP_POS_FRAMES
+    seeking is not frame-accurate for every codec, so the position reached
+    is read back and the remaining frames are skipped by decoding; if the
+    seek overshot, reading restarts from the beginning.
+    """
+    cap = cv2.VideoCapture(path)
+    if not start:
+        return cap
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    pos = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+    if not 0 <= pos <= start:
+        cap.release()
+        cap = cv2.VideoCapture(path)
+        pos = 0
+    while pos < start and cap.grab():
+        pos += 1
+    return cap
+
+
+def convert_segment(path, start, end, out_path, batch_size=BATCH_SIZE):
+    """
+    Convert frames [start, end) of a video to greyscale into out_path (XVID AVI).
+    Returns: (frames_written, seconds)
+    """
+    t0 = time.perf_counter()
+    fps, width, height, _ = video_info(path)
+    cap = open_at(path, start)
+    writer = cv2.VideoWriter(out_path, cv2.VideoWriter_fourcc(*"XVID"), fps,
+                             (width, height), isColor=False)
+
+    batches = queue.Queue(maxsize=2)            # decode at most 2 batches ahead
+    stop = threading.Event()
+    count = None if end is None else end - start
+    reader = threading.Thread(target=_read_batches, daemon=True,
+                              args=(cap, count, batch_size, (height, width, 3), batches, stop))
+    reader.start()
+
+    frames = 0
+    try:
+        while True:
+            batch = batches.get()
+            if batch is None:
+                break
+            if isinstance(batch, BaseException):
+                raise batch
+            n = batch.shape[0]
+            # One cvtColor call for the whole batch: stack frames vertically
+            grey = cv2.cvtColor(batch.reshape(n * height, width, 3), cv2.COLOR_BGR2GRAY)
+            for frame in grey.reshape(n, height, width):
+                writer.write(frame)
+            frames += n
+    finally:
+        # If the loop above failed, unblock the reader before waiting for it
+        stop.set()
+        while True:
+            try:
+                batches.get_nowait()
+            except queue.Empty:
+                break
+        reader.join()
+        cap.release()
+        writer.release()
+    return frames, time.perf_counter() - t0
+
+
+# ──────────────────────────────────────────────────────────
+#  CONCATENATION
+# ──────────────────────────────────────────────────────────
+
+def concat_segments(segment_paths, output_path):
+    """
+    Join segment files. Uses ffmpeg stream copy (lossless) when available,
+    otherwise re-encodes frame by frame with OpenCV.
+    """
+    if len(segment_paths) == 1:
+        shutil.move(segment_paths[0], output_path)
+        return
+    if shutil.which("ffmpeg"):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            for p in segment_paths:
+                escaped = os.path.abspath(p).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+            list_path = f.name
+        try:
+            subprocess.run(["ffmpeg", "-v", "error", "-y", "-f", "concat", "-safe", "0",
+                            "-i", list_path, "-c", "copy", output_path], check=True)
+        finally:
+            os.remove(list_path)
+        return
+
+    print("Warning: ffmpeg not found; segments are re-encoded while joining.")
+    fps, width, height, _ = video_info(segment_paths[0])
+    writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*"XVID"), fps,
+                             (width, height), isColor=False)
+    try:
+        for p in segment_paths:
+            cap = cv2.VideoCapture(p)
+            while True:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                writer.write(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+            cap.release()
+    finally:
+        writer.release()
+
+
+# ──────────────────────────────────────────────────────────
+#  DRIVER
+# ──────────────────────────────────────────────────────────
+
+def convert_videos(videos, output_dir, workers=None, batch_size=BATCH_SIZE):
+    """
+    Convert every video to greyscale using all segments of all videos as
+    parallel work items. Returns a list of per-video stats dicts.
+    """
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix="grey_segments_", dir=output_dir)
+
+    stats = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = []
+            for video in videos:
+                name = os.path.splitext(os.path.basename(video))[0]
+                try:
+                    segments = plan_segments(video, workers * SEGMENTS_PER_WORKER)
+                except Exception as e:
+                    print(f"Error: {os.path.basename(video)}: {e}")
+                    continue
+                seg_paths = [os.path.join(work_dir, f"{name}_{i:04d}.avi")
+                             for i in range(len(segments))]
+                futures = [pool.submit(convert_segment, video, s, e, p, batch_size)
+                           for (s, e), p in zip(segments, seg_paths)]
+                jobs.append((video, name, seg_paths, futures, time.perf_counter()))
+
+            for video, name, seg_paths, futures, started in jobs:
+                # A failed video is reported and skipped; the others carry on
+                output_path = os.path.join(output_dir, f"{name}_grey.avi")
+                try:
+                    results = [f.result() for f in futures]
+                    concat_segments(seg_paths, output_path)
+                except Exception as e:
+                    print(f"Error: {os.path.basename(video)}: {e}")
+                    continue
+
+                frames = sum(r[0] for r in results)
+                busy = sum(r[1] for r in results)
+                wall = time.perf_counter() - started
+                stats.append({
+                    "video": video,
+                    "output": output_path,
+                    "segments": len(seg_paths),
+                    "frames": frames,
+                    "seconds": wall,
+                    "frames_per_second": frames / wall if wall else 0.0,
+                    "frames_per_core_second": frames / busy if busy else 0.0,
+                })
+                expected = video_info(video)[3]
+                if expected > 0 and frames != expected:
+                    print(f"Warning: {os.path.basename(video)}: wrote {frames} frames, "
+                          f"the source reports {expected}.")
+                print(f"Converted: {os.path.basename(video)} ({frames} frames, "
+                      f"{len(seg_paths)} segments) → {os.path.basename(output_path)}  "
+                      f"[{stats[-1]['frames_per_second']:.0f} fps, "
+                      f"{stats[-1]['frames_per_core_second']:.0f} fps/core]")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame-parallel greyscale video converter")
+    parser.add_argument("videos_dir")
+    parser.add_argument("grey_dir")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per core")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE, help="frames per batch")
+    args = parser.parse_args()
+
+    videos = []
+    for ext in VIDEO_EXTENSIONS:
+        videos += glob.glob(os.path.join(args.videos_dir, f"*{ext}"))
+    if not videos:
+        print(f"No videos found! Add videos to: {args.videos_dir}")
+        return
+
+    start = time.perf_counter()
+    stats = convert_videos(sorted(videos), args.grey_dir, args.workers, args.batch)
+    elapsed = time.perf_counter() - start
+    frames = sum(s["frames"] for s in stats)
+    print(f"\nDone! {len(stats)} videos converted to greyscale: {frames} frames in "
+          f"{elapsed:.2f}s ({frames / elapsed if elapsed else 0:.0f} fps)")
+    if len(stats) != len(videos):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
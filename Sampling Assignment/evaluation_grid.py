@@ -0,0 +1,301 @@
+"""
+Parallel (sampling method × model × seed) evaluation grid.
+
+The notebook trains every (sampling method, model) pair one after another
+and refits the scaler inside the loop. This runner:
+
+  - writes the feature matrix once as X.npy; worker processes open it with
+    np.load(mmap_mode="r"), so every process shares one copy through the
+    page cache
+  - represents each sample as an index array (see samplers.py) and gathers
+    X[idx] only inside the worker that fits on it
+  - fits the StandardScaler once per sample and stores its mean / scale next
+    to the sample's indices, instead of refitting it once per (sample, model)
+  - fans the (sample, model) fits out over a process pool, submitting a
+    sample's fits as soon as that sample is drawn
+  - folds every finished fit into the result table as it arrives
+
+Samplers and models are registries (name → function), so growing the grid
+is a matter of adding entries to SAMPLERS / MODELS.
+
+Usage:
+  python evaluation_grid.py --seeds 10 --workers 8 --output results.csv
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import concurrent.futures as cf
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import accuracy_score
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.svm import SVC
+from sklearn.naive_bayes import GaussianNB
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+from samplers import SAMPLERS, load_arrays, save_arrays, open_arrays
+
+
+DATA_FILE = "Creditcard_data.csv"
+TEST_SIZE = 0.3
+SPLIT_SEED = 42                 # the fixed global test set, as in the notebook
+
+
+# ──────────────────────────────────────────────────────────
+#  REGISTRIES
+# ──────────────────────────────────────────────────────────
+
+# name → factory(seed) -> unfitted estimator
+MODELS = {
+    "Logistic Regression": lambda seed: LogisticRegression(max_iter=1000),
+    "Decision Tree": lambda seed: DecisionTreeClassifier(random_state=seed),
+    "Random Forest": lambda seed: RandomForestClassifier(n_estimators=100, random_state=seed),
+    "SVM": lambda seed: SVC(),
+    "Naive Bayes": lambda seed: GaussianNB(),
+}
+
+
+# ──────────────────────────────────────────────────────────
+#  SAMPLE MATERIALIZATION (parent process)
+# ──────────────────────────────────────────────────────────
+
+def split_test(y):
+    """
+    Fixed global test set (stratified, seed 42, as in the notebook).
+    Returns: test row indices
+    """
+    _, test_idx = train_test_split(np.arange(len(y)), test_size=TEST_SIZE, stratify=y,
+                                   random_state=SPLIT_SEED)
+    return np.sort(test_idx)
+
+
+def prepare_sample(X, y, sampler_name, seed, work_dir):
+    """
+    Draw one sample, split it and fit its scaler. Writes the training indices
+    and the scaler's (mean, scale) to work_dir/<sampler>_<seed>/. Returns the
+    sample directory, or None if the sample holds a single class.
+    """
+    idx = SAMPLERS[sampler_name](X, y, seed)
+    ys = y[idx]
+    if np.unique(ys).size < 2:
+        return None
+    train_idx, _ = train_test_split(idx, test_size=TEST_SIZE, stratify=ys, random_state=seed)
+    train_idx = np.sort(train_idx)
+
+    # StandardScaler statistics (population std, zero variance → scale 1)
+    X_train = X[train_idx]
+    mean = X_train.mean(axis=0)
+    scale = X_train.std(axis=0)
+    scale[scale == 0] = 1.0
+    del X_train
+
+    sample_dir = os.path.join(work_dir, f"{sampler_name.replace(' ', '_')}_{seed}")
+    os.makedirs(sample_dir, exist_ok=True)
+    np.save(os.path.join(sample_dir, "train_idx.npy"), train_idx)
+    np.save(os.path.join(sample_dir, "scaler.npy"), np.stack([mean, scale]))
+    return sample_dir
+
+
+# ──────────────────────────────────────────────────────────
+#  MODEL FITS (worker processes)
+# ──────────────────────────────────────────────────────────
+
+_worker = {}
+
+
+def _worker_init(data_dir, test_idx):
+    """Map the shared arrays and run one BLAS thread per worker process."""
+    _worker["X"], _worker["y"] = open_arrays(data_dir)
+    _worker["test_idx"] = test_idx
+    _worker["y_test"] = np.asarray(_worker["y"][test_idx])
+    if threadpool_limits is not None:
+        _worker["limits"] = threadpool_limits(limits=1)
+
+
+def evaluate(sample_dir, sampler_name, model_name, seed):
+    """
+    Fit one model on one sample, gathering its rows from the shared matrix.
+    Returns: (sampler_name, model_name, seed, accuracy, fit_seconds)
+    """
+    start = time.perf_counter()
+    X, y = _worker["X"], _worker["y"]
+    train_idx = np.load(os.path.join(sample_dir, "train_idx.npy"))
+    mean, scale = np.load(os.path.join(sample_dir, "scaler.npy"))
+
+    X_train = (X[train_idx] - mean) / scale
+    X_test = (X[_worker["test_idx"]] - mean) / scale
+
+    model = MODELS[model_name](seed)
+    model.fit(X_train, y[train_idx])
+    acc = accuracy_score(_worker["y_test"], model.predict(X_test))
+    return sampler_name, model_name, seed, float(acc), time.perf_counter() - start
+
+
+# ──────────────────────────────────────────────────────────
+#  RESULTS
+# ──────────────────────────────────────────────────────────
+
+class ResultGrid:
+    """
+    Accumulates accuracies as fits finish. Keeps running sums per
+    (model, sampler) so the pivot table is available at any point, and
+    optionally appends every row to a CSV file as it arrives.
+    """
+
+    COLUMNS = ["Sampling Method", "Model", "Seed", "Accuracy", "Seconds"]
+
+    def __init__(self, csv_path=None):
+        self.count = 0
+        self._sum = {}
+        self._sq = {}
+        self._n = {}
+        self._file = None
+        if csv_path:
+            self._file = open(csv_path, "w", encoding="utf-8")
+            self._file.write(",".join(self.COLUMNS) + "\n")
+
+    def add(self, sampler_name, model_name, seed, acc, seconds):
+        key = (model_name, sampler_name)
+        self._sum[key] = self._sum.get(key, 0.0) + acc
+        self._sq[key] = self._sq.get(key, 0.0) + acc * acc
+        self._n[key] = self._n.get(key, 0) + 1
+        self.count += 1
+        if self._file:
+            self._file.write(f"{sampler_name},{model_name},{seed},{acc:.6f},{seconds:.4f}\n")
+            self._file.flush()
+
+    def pivot(self, std=False):
+        """Model × Sampling Method table of mean (or std) accuracy over seeds."""
+        values = {}
+        for key, n in self._n.items():
+            mean = self._sum[key] / n
+            if std:
+                values[key] = np.sqrt(max(self._sq[key] / n - mean * mean, 0.0))
+            else:
+                values[key] = mean
+        table = pd.Series(values, dtype=float).unstack()
+        table.index.name = "Model"
+        table.columns.name = "Sampling Method"
+        return table
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+# ──────────────────────────────────────────────────────────
+#  DRIVER
+# ──────────────────────────────────────────────────────────
+
+def run_grid(data_path=DATA_FILE, samplers=None, models=None, seeds=(SPLIT_SEED,),
+             workers=None, csv_path=None, work_dir=None, verbose=True):
+    """
+    Evaluate every (sampler × model × seed) combination on a process pool.
+    Returns: ResultGrid
+    """
+    samplers = list(samplers or SAMPLERS)
+    models = list(models or MODELS)
+    workers = workers or os.cpu_count() or 1
+    own_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix="sampling_grid_")
+
+    grid = ResultGrid(csv_path)
+    total = len(samplers) * len(models) * len(seeds)
+    start = time.perf_counter()
+    try:
+        X, y = load_arrays(data_path)
+        save_arrays(X, y, work_dir)
+        del X, y
+        # From here on the parent also reads the single on-disk copy
+        X, y = open_arrays(work_dir)
+        test_idx = split_test(y)
+
+        with cf.ProcessPoolExecutor(max_workers=workers, initializer=_worker_init,
+                                    initargs=(work_dir, test_idx)) as pool:
+            pending = set()
+
+            def collect(block):
+                nonlocal pending
+                done, pending = cf.wait(pending, timeout=None if block else 0,
+                                        return_when=cf.FIRST_COMPLETED)
+                for future in done:
+                    grid.add(*future.result())
+                if verbose and done:
+                    print(f"\r  {grid.count}/{total} fits done", end="", flush=True)
+
+            for seed in seeds:
+                for sampler_name in samplers:
+                    sample_dir = prepare_sample(X, y, sampler_name, seed, work_dir)
+                    if sample_dir is None:
+                        total -= len(models)
+                        continue
+                    for model_name in models:
+                        pending.add(pool.submit(evaluate, sample_dir, sampler_name,
+                                                model_name, seed))
+                    collect(block=False)
+            while pending:
+                collect(block=True)
+    finally:
+        grid.close()
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    if verbose:
+        print(f"\n{grid.count} fits in {time.perf_counter() - start:.1f}s")
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel sampling × model evaluation grid")
+    parser.add_argument("--data", default=DATA_FILE)
+    parser.add_argument("--seeds", type=int, default=1, help="number of seeds per combination")
+    parser.add_argument("--base-seed", type=int, default=SPLIT_SEED)
+    parser.add_argument("--samplers", help="comma-separated subset of: " + ", ".join(SAMPLERS))
+    parser.add_argument("--models", help="comma-separated subset of: " + ", ".join(MODELS))
+    parser.add_argument("--workers", type=int, default=None, help="default: one per core")
+    parser.add_argument("--output", help="CSV receiving one row per fit")
+    parser.add_argument("--table", help="save the mean-accuracy pivot table as CSV")
+    args = parser.parse_args()
+
+    def pick(value, registry):
+        if not value:
+            return list(registry)
+        names = [v.strip() for v in value.split(",") if v.strip()]
+        unknown = [n for n in names if n not in registry]
+        if unknown:
+            parser.error(f"unknown name(s): {', '.join(unknown)}")
+        return names
+
+    samplers = pick(args.samplers, SAMPLERS)
+    models = pick(args.models, MODELS)
+    seeds = range(args.base_seed, args.base_seed + args.seeds)
+
+    grid = run_grid(args.data, samplers, models, seeds, args.workers, args.output)
+    if grid.count == 0:
+        print("No results: every sample contained a single class.")
+        sys.exit(1)
+
+    final_table = grid.pivot()
+    print("\nMean accuracy over seeds:")
+    print(final_table.round(4))
+    if args.seeds > 1:
+        print("\nStd of accuracy over seeds:")
+        print(grid.pivot(std=True).round(4))
+    if args.table:
+        final_table.to_csv(args.table)
+        print(f"\nTable saved to {args.table}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Index-based samplers for the Sampling Assignment.
+
+Every sampler takes the feature matrix X, the labels y and a seed and
+returns a sorted int64 array of row indices; nothing is copied. Training
+code gathers X[idx] only when it needs the rows, so memory stays at one
+copy of the dataset however many samplers and repetitions run. X can be a
+read-only array or a read-only np.memmap (see load_arrays).
+
+The same seed always gives the same indices.
+
+For tables too large to load, stream_cluster() runs the cluster sampler
+out of core over CSV / Parquet chunks.
+
+Usage:
+  from samplers import SAMPLERS, load_arrays
+  X, y = load_arrays("Creditcard_data.csv")
+  idx = SAMPLERS["Stratified"](X, y, seed=42)
+
+  python samplers.py transactions.parquet --output cluster_idx.npy --chunk-size 500000
+"""
+
+import os
+import argparse
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.cluster import KMeans, MiniBatchKMeans
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+TARGET = "Class"
+
+
+def load_arrays(path, target=TARGET):
+    """
+    Read the CSV once into a float64 feature matrix and a label vector,
+    both marked read-only. Returns: (X, y)
+    """
+    df = pd.read_csv(path)
+    y = df.pop(target).to_numpy()
+    X = np.ascontiguousarray(df.to_numpy(dtype=np.float64))
+    del df
+    X.setflags(write=False)
+    y.setflags(write=False)
+    return X, y
+
+
+def save_arrays(X, y, directory):
+    """Write X and y as X.npy / y.npy so other processes can memory-map them."""
+    np.save(f"{directory}/X.npy", X)
+    np.save(f"{directory}/y.npy", y)
+
+
+def open_arrays(directory):
+    """Read-only memory maps of the arrays written by save_arrays. Returns: (X, y)"""
+    return (np.load(f"{directory}/X.npy", mmap_mode="r"),
+            np.load(f"{directory}/y.npy", mmap_mode="r"))
+
+
+# ──────────────────────────────────────────────────────────
+#  SAMPLERS
+# ──────────────────────────────────────────────────────────
+
+def simple_random(X, y, seed, frac=0.5):
+    """frac of the rows drawn without replacement."""
+    rng = np.random.default_rng(seed)
+    n = len(y)
+    return np.sort(rng.choice(n, size=int(round(frac * n)), replace=False))
+
+
+def systematic(X, y, seed, step=2):
+    """Every step-th row from a seeded starting offset."""
+    rng = np.random.default_rng(seed)
+    return np.arange(rng.integers(step), len(y), step, dtype=np.int64)
+
+
+def stratified(X, y, seed, frac=0.5):
+    """frac of the rows of every class, so class proportions are preserved."""
+    rng = np.random.default_rng(seed)
+    parts = []
+    for label in np.unique(y):
+        members = np.flatnonzero(y == label)
+        take = int(round(frac * members.size))
+        parts.append(rng.choice(members, size=take, replace=False))
+    return np.sort(np.concatenate(parts))
+
+
+def cluster(X, y, seed, n_clusters=5, keep=(0, 1)):
+    """
+    Rows of clusters `keep` after KMeans on a 2-D PCA projection
+    (the notebook's method, without copying the DataFrame to add a column).
+    """
+    X_pca = PCA(n_components=2).fit_transform(X)
+    labels = KMeans(n_clusters=n_clusters, random_state=seed).fit_predict(X_pca)
+    return np.flatnonzero(np.isin(labels, keep)).astype(np.int64)
+
+
+def bootstrap(X, y, seed):
+    """len(y) rows drawn with replacement."""
+    rng = np.random.default_rng(seed)
+    n = len(y)
+    return np.sort(rng.integers(0, n, size=n))
+
+
+# name → sampler(X, y, seed) -> index array
+SAMPLERS = {
+    "Simple Random": simple_random,
+    "Systematic": systematic,
+    "Stratified": stratified,
+    "Cluster": cluster,
+    "Bootstrap": bootstrap,
+}
+
+
+# ──────────────────────────────────────────────────────────
+#  STREAMING CLUSTER SAMPLING (out of core)
+# ──────────────────────────────────────────────────────────
+
+CHUNK_SIZE = 100_000
+
+
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+
+def feature_columns(path, target=TARGET):
+    """Every column of the file except the target."""
+    if _is_parquet(path):
+        if pq is None:
+            raise ImportError("Reading Parquet needs pyarrow (pip install pyarrow)")
+        names = pq.ParquetFile(path).schema_arrow.names
+    else:
+        names = list(pd.read_csv(path, nrows=0).columns)
+    return [c for c in names if c != target]
+
+
+def iter_chunks(path, columns, chunk_size=CHUNK_SIZE):
+    """Yield float64 (rows, len(columns)) arrays of the file, chunk_size rows at a time."""
+    if _is_parquet(path):
+        if pq is None:
+            raise ImportError("Reading Parquet needs pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield np.column_stack([batch.column(c).to_numpy(zero_copy_only=False)
+                                   for c in columns]).astype(np.float64, copy=False)
+    else:
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_size):
+            yield chunk[columns].to_numpy(dtype=np.float64)
+
+
+def stream_cluster(path, output, seed=42, n_clusters=5, keep=(0, 1), columns=None,
+                   chunk_size=CHUNK_SIZE, target=TARGET, verbose=True):
+    """
+    Cluster sampling over a CSV or Parquet file that does not fit in memory.
+
+    Three streaming passes, each holding one chunk at a time:
+      1. IncrementalPCA(2).partial_fit on every chunk
+      2. MiniBatchKMeans.partial_fit on the projected chunks
+      3. label every projected chunk and append the row indices of the
+         clusters in `keep` to a scratch file
+
+    The indices are then written to `output` as a .npy file (int64), copied
+    in chunks so memory stays bounded by chunk_size.
+
+    Returns: number of selected rows
+    """
+    columns = list(columns or feature_columns(path, target))
+
+    pca = IncrementalPCA(n_components=2)
+    for chunk in iter_chunks(path, columns, chunk_size):
+        if len(chunk) >= 2:                  # partial_fit needs n_samples >= n_components
+            pca.partial_fit(chunk)
+    if verbose:
+        print(f"Pass 1/3: PCA fitted on {pca.n_samples_seen_} rows")
+
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=seed,
+                             batch_size=min(chunk_size, 4096), n_init=3)
+    for chunk in iter_chunks(path, columns, chunk_size):
+        if len(chunk) >= n_clusters:         # first partial_fit needs n_clusters rows
+            kmeans.partial_fit(pca.transform(chunk))
+    if verbose:
+        print("Pass 2/3: KMeans fitted")
+
+    scratch = output + ".part"
+    selected = 0
+    offset = 0
+    with open(scratch, "wb") as f:
+        for chunk in iter_chunks(path, columns, chunk_size):
+            labels = kmeans.predict(pca.transform(chunk))
+            idx = np.flatnonzero(np.isin(labels, keep)).astype(np.int64) + offset
+            idx.tofile(f)
+            selected += idx.size
+            offset += len(chunk)
+    if verbose:
+        print(f"Pass 3/3: {selected} of {offset} rows in clusters {list(keep)}")
+
+    try:
+        result = np.lib.format.open_memmap(output, mode="w+", dtype=np.int64, shape=(selected,))
+        if selected:
+            part = np.memmap(scratch, dtype=np.int64, mode="r", shape=(selected,))
+            for start in range(0, selected, chunk_size):
+                result[start:start + chunk_size] = part[start:start + chunk_size]
+            del part
+        result.flush()
+        del result
+    finally:
+        os.remove(scratch)
+    return selected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming cluster sampler (CSV or Parquet)")
+    parser.add_argument("data", help="CSV or Parquet file")
+    parser.add_argument("--output", default="cluster_indices.npy")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clusters", type=int, default=5)
+    parser.add_argument("--keep", default="0,1", help="comma-separated cluster labels to keep")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--target", default=TARGET, help="label column excluded from features")
+    args = parser.parse_args()
+
+    keep = tuple(int(k) for k in args.keep.split(","))
+    stream_cluster(args.data, args.output, args.seed, args.clusters, keep,
+                   chunk_size=args.chunk_size, target=args.target)
+    print(f"Indices saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()